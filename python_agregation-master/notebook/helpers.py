@@ -7,42 +7,88 @@ from ipywidgets import *
 import matplotlib.pyplot as plt
 
 from nbconvert.filters.markdown_mistune import markdown2html_mistune
+import asyncio
 import inspect
+import traceback
 
 
-def _check_parameters_are_OK(parameters, plot_function):
+def _check_parameters_are_OK(parameters, plot_function, first='fig'):
     """ Check that ther parameters are argument of the plot_function"""
-    if inspect.getfullargspec(plot_function).args[0]!='fig':
-        raise Exception('First argument of "{f.__name__}" should be "fig"'.format(f=plot_function))
+    if inspect.getfullargspec(plot_function).args[0]!=first:
+        raise Exception('First argument of "{f.__name__}" should be "{first}"'.format(f=plot_function, first=first))
     func_parameters = inspect.getfullargspec(plot_function).args[1:]
     if set(parameters.keys())<=set(func_parameters):
         return
     raise Exception('The parameters {} are not all arguments of the function "{f.__name__}"'.format(set(parameters.keys()), f=plot_function))
     
-def display_simulation_window(titre, parameters, plot_function, doc):
-    _check_parameters_are_OK(parameters, plot_function)
+def display_simulation_window(titre, parameters, plot_function=None, doc='', setup_function=None, update_function=None,
+                              delay=0.03):
+    """ Application avec la figure et les sliders
+
+    Deux façons de tracer la figure :
+
+    * plot_function(fig, **parameters) : la figure est effacée et entièrement
+      refaite à chaque changement d'un slider
+    * setup_function(fig) crée une seule fois les axes et les courbes et
+      renvoie un dictionnaire lines ; update_function(lines, **parameters)
+      met seulement à jour les données des courbes (set_data, set_xlim, ...).
+      C'est beaucoup plus rapide.
+
+    delay : temps (en s) pendant lequel les changements des sliders sont
+    regroupés avant de refaire la figure
+    """
+    if update_function is not None:
+        _check_parameters_are_OK(parameters, update_function, first='lines')
+    else:
+        _check_parameters_are_OK(parameters, plot_function)
     plt.close(titre)
     fig = plt.figure(titre)
+    lines = setup_function(fig) if setup_function is not None else None
 
     
     def update(**kwd):
+        if update_function is not None:
+            update_function(lines, **kwd)
+            fig.canvas.draw_idle()
+            return
         fig.clf()
         plot_function(fig=fig, **kwd)
         fig.canvas.draw()
         fig.canvas.flush_events()
         
+    # Les changements des sliders sont regroupés : pendant l'attente de delay
+    # secondes et pendant le calcul de la figure, seule la dernière valeur
+    # compte. Le calcul est fait dans la boucle asyncio du noyau.
+    state = {'task':None, 'pending':False}
+
+    async def redraw():
+        try:
+            while state['pending']:
+                await asyncio.sleep(delay)
+                state['pending'] = False
+                update(**{k:w.value for k,w in parameters.items()})
+        except Exception:
+            traceback.print_exc()
+        finally:
+            state['task'] = None
+
     def observer(change):
-        for k, w in parameters.items():
-            w.continuous_update=False
-        kwargs = {k:w.value for k,w in parameters.items()}
-        update(**kwargs)
-        for k, w in parameters.items():
-            w.continuous_update=True
+        state['pending'] = True
+        if state['task'] is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Pas de boucle asyncio (premier affichage, ancien noyau)
+            state['pending'] = False
+            update(**{k:w.value for k,w in parameters.items()})
+            return
+        state['task'] = loop.create_task(redraw())
 
     for k,w in parameters.items():
         w.observe(observer, 'value')
         
-    observer(None)
+    update(**{k:w.value for k,w in parameters.items()})
 
     doc += '\n-------------'
     w_doc = widgets.HTMLMath(
@@ -35,8 +35,8 @@ import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 
 from programmes_lecons import FloatSlider, IntSlider
-from programmes_lecons import make_param_widgets, make_choose_plot, make_reset_button
-from programmes_lecons import justify
+from programmes_lecons import make_param_widgets, make_choose_plot, make_reset_button, BlitRenderer
+from programmes_lecons import justify, cached_text, memoize, LineRegistry
 
 titre = r"Figure de diffraction par N fentes"
 
@@ -70,6 +70,8 @@ parameters = dict(
 # --- Modèle physique --------------------------------------
 #===========================================================
 
+# Les facteurs sont gardés en mémoire : ils servent à plusieurs courbes
+@memoize(maxsize=4)
 def forme(x, b, lamb, D):
     """
     Calcule le facteur de forme du reseau.
@@ -78,6 +80,7 @@ def forme(x, b, lamb, D):
     return (np.sinc(b*x/D/lamb))**2
 
 
+@memoize(maxsize=4)
 def structure(x, lamb, a, N, D):
     """
     Calcule le facteur de structure du reseau.
@@ -97,21 +100,27 @@ def signal(x, lamb, a, N, D):
 # --- Réalisation du plot ----------------------------------
 #===========================================================
 
+# Chaque courbe est calculée uniquement si elle est visible (voir LineRegistry)
+def courbe_fonction(x, lamb, a, b, N, D):
+    return x, forme(x, b, lamb, D)*structure(x, lamb, a, N, D)
+
+def courbe_forme(x, b, lamb, D):
+    return x, forme(x, b, lamb, D)
+
+def courbe_structure(x, lamb, a, N, D):
+    return x, structure(x, lamb, a, N, D)
+
 # La fonction plot_data est appelée à chaque modification des paramètres
-def plot_data(lamb, N, a, b, D):
+def plot_data(lamb, N, a, b, D, resolution=1):
     # Conversion en SI
     lamb = lamb*1E-6
     a = a*1E-6
     b = b*1E-6
     
-    x = np.linspace(-1, 1, 1001) #Zone observee : +/- 1 cm
+    x = np.linspace(-1, 1, int(1000*resolution)+1) #Zone observee : +/- 1 cm
 
-    form = forme(x, b, lamb, D)
-    struct = structure(x, lamb, a, N, D)
-
-    lines['Fonction'].set_data(x, form*struct)  # On met a jour le signal
-    lines['Facteur de forme'].set_data(x, form)  # On met a jour la forme
-    lines['Facteur de structure'].set_data(x, struct)  # On met a jour la structure
+    # On met a jour le signal, la forme et la structure
+    lines.update_data(x=x, lamb=lamb, a=a, b=b, N=N, D=D)
 
 #    arrow_struct.set_positions((0, -0.05), (lamb*D/a, -0.05))  
 #    arrow_struct_text.set_x(lamb*D/a/2)
@@ -119,19 +128,19 @@ def plot_data(lamb, N, a, b, D):
 #    arrow_forme.set_positions((-lamb*D/b/2, np.sinc(.5)**2), (lamb*D/b/2, np.sinc(.5)**2))  
 #    arrow_forme_text.set_x(lamb*D/b/2)
 
-    fig.canvas.draw_idle()
-
 #===========================================================
 # --- Création de la figure et mise en page ----------------
 #===========================================================
 
 fig = plt.figure()
 fig.suptitle(titre)
-fig.text(0.02, .9, justify(description), multialignment='left', verticalalignment='top')
+cached_text(fig, 0.02, .9, justify(description), multialignment='left', verticalalignment='top')
 
 ax = fig.add_axes([0.35, 0.3, 0.6, 0.6])
 
-lines = {}
+lines = LineRegistry(producers={'Fonction':courbe_fonction,
+                                'Facteur de forme':courbe_forme,
+                                'Facteur de structure':courbe_structure})
 lines['Fonction'], = ax.plot([],[], lw=2, color='red')
 lines['Facteur de forme'], = ax.plot([],[], lw=1.5, ls='--', color='blue', visible=False)
 lines['Facteur de structure'], = ax.plot([], [], lw=1.5, ls='--', color='green', visible=False)
@@ -150,7 +159,9 @@ ax.set_ylim(-0.1, 1.2)
 #ax.add_patch(arrow_forme)       
 #arrow_forme_text = ax.text(0, np.sinc(0.5)**2, '$\lambda D/b$', verticalalignment='center', horizontalalignment='left')
 
-param_widgets = make_param_widgets(parameters, plot_data, slider_box=[0.55, 0.07, 0.4, 0.15])
+renderer = BlitRenderer(fig, lines)
+param_widgets = make_param_widgets(parameters, plot_data, slider_box=[0.55, 0.07, 0.4, 0.15], renderer=renderer,
+                                   progressive=True)
 choose_widget = make_choose_plot(lines, box=[0.015, 0.15, 0.2, 0.15])
 reset_button = make_reset_button(param_widgets)
 
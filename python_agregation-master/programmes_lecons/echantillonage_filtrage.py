@@ -78,8 +78,6 @@ def plot_data(freq_ech=35):
     x, y = signal_entree(freq_ech)
     lines['Numérique'].set_data(x, y)
 
-    fig.canvas.draw_idle()
-
 
 #===========================================================
 # --- Création de la figure et mise en page ----------------
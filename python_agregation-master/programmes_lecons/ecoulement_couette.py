@@ -21,6 +21,8 @@ import numpy as np
 
 import programmes_lecons
 
+programmes_lecons.apply_style()
+
 titre = 'Écoulement de Couette plan'
 
 #Definition d'un maillage du plan dans lequel a lieu l'ecoulement
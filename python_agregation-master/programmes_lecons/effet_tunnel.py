@@ -39,8 +39,8 @@ from numpy.lib.scimath import sqrt
 import matplotlib.pyplot as plt
 
 from programmes_lecons import FloatSlider, IntSlider
-from programmes_lecons import make_param_widgets, make_choose_plot, make_reset_button
-from programmes_lecons import justify
+from programmes_lecons import make_param_widgets, make_choose_plot, make_reset_button, BlitRenderer
+from programmes_lecons import justify, cached_text
 
 titre = " Effet tunnel"
 
@@ -106,8 +106,8 @@ def limite_large_barriere(E, V, d):
 #===========================================================
 
 # La fonction plot_data est appelée à chaque modification des paramètres
-def plot_data(E_max=6, d=2):
-    E_abscisse = np.linspace(0, E_max, 200)
+def plot_data(E_max=6, d=2, resolution=1):
+    E_abscisse = np.linspace(0, E_max, int(200*resolution))
     T_exact = transmission(E_abscisse, V0, d)
     T_classique = transmission_classique(E_abscisse, V0, d)
     T_large_barriere, validite_large_barriere = limite_large_barriere(E_abscisse, V0, d)
@@ -118,8 +118,6 @@ def plot_data(E_max=6, d=2):
 
     ax.set_xlim(0, E_max)
 
-    fig.canvas.draw_idle()
-
 
 #===========================================================
 # --- Création de la figure et mise en page ----------------
@@ -127,7 +125,7 @@ def plot_data(E_max=6, d=2):
 
 fig = plt.figure()
 fig.suptitle(titre)
-fig.text(0.02, .9, justify(description), multialignment='left', verticalalignment='top')
+cached_text(fig, 0.02, .9, justify(description), multialignment='left', verticalalignment='top')
 
 ax = fig.add_axes([0.35, 0.25, 0.6, 0.65])
 
@@ -142,7 +140,9 @@ ax.set_ylabel('Transmission')
 ax.set_xlim(0, 6)
 ax.set_ylim(0, 1.2*V0)
 
-param_widgets = make_param_widgets(parameters, plot_data, slider_box=[0.45, 0.07, 0.5, 0.07])
+renderer = BlitRenderer(fig, lines)
+param_widgets = make_param_widgets(parameters, plot_data, slider_box=[0.45, 0.07, 0.5, 0.07], renderer=renderer,
+                                   progressive=True)
 choose_widget = make_choose_plot(lines, box=[0.015, 0.10, 0.2, 0.15])
 reset_button = make_reset_button(param_widgets)
 
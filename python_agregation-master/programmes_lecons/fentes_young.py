@@ -29,7 +29,7 @@ import matplotlib.pyplot as plt
 
 from programmes_lecons import FloatSlider, IntSlider
 from programmes_lecons import make_param_widgets, make_choose_plot, make_reset_button
-from programmes_lecons import justify
+from programmes_lecons import justify, cached_text
 
 titre = r"Interférence par des fentes d'Young"
 
@@ -87,14 +87,12 @@ def plot_data(lamb, a, w, L):
     lines['Fente Young'].set_data(x, fente_young(x, k, L, a, w))
     lines['Enveloppe'].set_data(x, enveloppe(x, k, L, a, w))
 
-    fig.canvas.draw_idle()
-
 #===========================================================
 # --- Création de la figure et mise en page ----------------
 #===========================================================
 fig = plt.figure()
 fig.suptitle(titre)
-fig.text(0.02, .9, description, multialignment='left', verticalalignment='top')
+cached_text(fig, 0.02, .9, description, multialignment='left', verticalalignment='top')
 
 ax = fig.add_axes([0.35, 0.3, 0.6, 0.6])
 
@@ -38,7 +38,7 @@ import matplotlib.pyplot as plt
 
 from programmes_lecons import FloatSlider, IntSlider
 from programmes_lecons import make_param_widgets, make_choose_plot, make_reset_button
-from programmes_lecons import justify
+from programmes_lecons import justify, cached_text
 
 
 #===========================================================
@@ -77,8 +77,6 @@ def plot_data(lamb, phi):
     lines['B'].set_data(x*1E9, onde(lamb, phi, x))
     lines['somme'].set_data(x*1E9, interference(lamb, phi, x))
 
-    fig.canvas.draw_idle()
-
 
 #===========================================================
 # --- Création de la figure et mise en page ----------------
@@ -86,7 +84,7 @@ def plot_data(lamb, phi):
 
 fig = plt.figure()
 fig.suptitle(titre)
-fig.text(0.02, .9, justify(description), multialignment='left', verticalalignment='top')
+cached_text(fig, 0.02, .9, justify(description), multialignment='left', verticalalignment='top')
 
 ax1, ax2, ax3 = fig.subplots(3, 1, sharex=True, sharey=True, 
             gridspec_kw={'left':0.35, 'bottom':0.3, 'top':0.9, 'hspace':0.05})
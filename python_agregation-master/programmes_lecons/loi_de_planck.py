@@ -35,8 +35,8 @@ import matplotlib.pyplot as plt
 import numpy as np
 
 from programmes_lecons import FloatSlider, IntSlider
-from programmes_lecons import make_param_widgets, make_choose_plot, make_reset_button, make_log_button
-from programmes_lecons import justify
+from programmes_lecons import make_param_widgets, make_choose_plot, make_reset_button, make_log_button, BlitRenderer
+from programmes_lecons import justify, cached_text, memoize, LineRegistry
 from programmes_lecons.constantes import c, h, k
 
 titre = r'Loi de Planck'
@@ -78,12 +78,14 @@ def loi_de_wien_nu(T, nu):
     return 2*h*nu**3/c**2 * 1/(np.exp(h*nu/(k*T)))
 
 
+@memoize(parameters)
 def loi_de_planck_lamb(T, lamb):
     return loi_de_planck_nu(T, c/lamb)*c/lamb**2
 
 def loi_de_rayleigh_jeans_lamb(T, lamb):
     return loi_de_rayleigh_jeans_nu(T, c/lamb)*c/lamb**2
 
+@memoize(parameters)
 def loi_de_wien_lamb(T, lamb):
     return loi_de_wien_nu(T, c/lamb)*c/lamb**2
 
@@ -94,18 +96,25 @@ def loi_de_wien_lamb(T, lamb):
 
 # La fonction plot_data est appelée à chaque modification des paramètres
 def plot_data(T):
+    # Seules les courbes visibles sont calculées (voir LineRegistry)
+    lines.update_data(T=T)
 
-    lines['Planck'].set_data(lamb*1E6, loi_de_planck_lamb(T, lamb)*1E-12)
-    lines['Wien'].set_data(lamb*1E6, loi_de_wien_lamb(T, lamb)*1E-12)
-    lines['Rayleigh-Jeans'].set_data(lamb*1E6, loi_de_rayleigh_jeans_lamb(T, lamb)*1E-12)
+def courbe_planck(T):
+    return lamb*1E6, loi_de_planck_lamb(T, lamb)*1E-12
 
+def courbe_wien(T):
+    return lamb*1E6, loi_de_wien_lamb(T, lamb)*1E-12
+
+def courbe_rayleigh_jeans(T):
+    return lamb*1E6, loi_de_rayleigh_jeans_lamb(T, lamb)*1E-12
+
+def max_planck(T):
     i = loi_de_planck_lamb(T, lamb).argmax()
-    lines['max'].set_data([lamb[i]*1E6], [loi_de_planck_lamb(T, lamb[i])*1E-12])
+    return [lamb[i]*1E6], [loi_de_planck_lamb(T, lamb[i])*1E-12]
 
+def max_wien(T):
     i = loi_de_wien_lamb(T, lamb).argmax()
-    lines['maxW'].set_data([lamb[i]*1E6], [loi_de_wien_lamb(T, lamb[i])*1E-12])
-
-    fig.canvas.draw_idle()
+    return [lamb[i]*1E6], [loi_de_wien_lamb(T, lamb[i])*1E-12]
 
 
 #===========================================================
@@ -114,7 +123,7 @@ def plot_data(T):
 
 fig = plt.figure()
 fig.suptitle(titre)
-fig.text(0.02, .9, justify(description), multialignment='left', verticalalignment='top')
+cached_text(fig, 0.02, .9, justify(description), multialignment='left', verticalalignment='top')
 
 ax = fig.add_axes([0.35, 0.3, 0.6, 0.6])
 
@@ -126,7 +135,9 @@ ax.text(c/4.5E14*1E6, 14, "rouge :  633 nm", color='red', rotation='vertical',ho
 ax.text(c/5.6E14*1E6, 14, "vert : 525 nm", color='green', rotation='vertical',horizontalalignment='left', verticalalignment='top')
 ax.text(c/6.5E14*1E6, 14, "violet : 425 nm", color='purple', rotation='vertical',horizontalalignment='left', verticalalignment='top')
 
-lines = {}
+lines = LineRegistry(producers={'Planck':courbe_planck, 'Wien':courbe_wien,
+                                'Rayleigh-Jeans':courbe_rayleigh_jeans,
+                                'max':max_planck, 'maxW':max_wien})
 lines['Planck'], = ax.plot([], [], lw=2, color='blue', visible=True)
 lines['Wien'], = ax.plot([], [], lw=2,color='black', visible=False)
 lines['Rayleigh-Jeans'], = ax.plot([], [], lw=2, color='brown',visible=False)
@@ -144,7 +155,8 @@ ax.set_xlabel(r"$\lambda$ [$\mathrm{\mu m}$]")
 #ax.set_ylabel(r"$B_\nu$ [$\mathrm{W.m^{-2}.Hz^{-1}.sr^{-1}}$]")
 ax.set_ylabel(r"$B_\nu$ [$\mathrm{kW.m^{-2}.nm^{-1}.sr^{-1}}$]")
 
-param_widgets = make_param_widgets(parameters, plot_data, slider_box=[0.35, 0.07, 0.4, 0.05])
+renderer = BlitRenderer(fig, lines)
+param_widgets = make_param_widgets(parameters, plot_data, slider_box=[0.35, 0.07, 0.4, 0.05], renderer=renderer)
 choose_widget = make_choose_plot(lines, box=[0.015, 0.25, 0.2, 0.15], which=[('Planck', 'max'), ('Wien', 'maxW'), 'Rayleigh-Jeans'])
 reset_button = make_reset_button(param_widgets)
 log_button =  make_log_button(ax, ylims={'log':(0.001, 1000), 'linear':ax.get_ylim()})
@@ -25,7 +25,7 @@ import matplotlib.pyplot as plt
 
 from programmes_lecons import FloatSlider, IntSlider
 from programmes_lecons import make_param_widgets, make_choose_plot, make_reset_button
-from programmes_lecons import justify
+from programmes_lecons import justify, cached_text
 from programmes_lecons.constantes import *
 
 titre = "Orbites de Keppler"
@@ -97,7 +97,7 @@ def plot_data(theta_0, mass_ratio, a, e):
 
 fig = plt.figure()
 fig.suptitle(titre)
-fig.text(0.02, .9, justify(description), multialignment='left', verticalalignment='top')
+cached_text(fig, 0.02, .9, justify(description), multialignment='left', verticalalignment='top')
 
 ax = fig.add_axes([0.35, 0.25, 0.6, 0.65], aspect='equal')
 
@@ -26,7 +26,7 @@ import matplotlib.pyplot as plt
 
 from programmes_lecons import FloatSlider, IntSlider
 from programmes_lecons import make_param_widgets, make_choose_plot, make_reset_button
-from programmes_lecons import justify
+from programmes_lecons import justify, cached_text
 
 
 titre = r"Oscillateur amorti"
@@ -76,7 +76,7 @@ def plot_data(amp, freq, phi, tau):
 
 fig = plt.figure()
 fig.suptitle(titre)
-fig.text(0.02, .9, justify(description), multialignment='left', verticalalignment='top')
+cached_text(fig, 0.02, .9, justify(description), multialignment='left', verticalalignment='top')
 
 ax = fig.add_axes([0.35, 0.3, 0.6, 0.6])
 
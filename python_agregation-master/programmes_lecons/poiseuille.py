@@ -24,6 +24,8 @@ import numpy as np
 
 import programmes_lecons
 
+programmes_lecons.apply_style()
+
 
 titre = "Écoulement de Poiseuille"
 
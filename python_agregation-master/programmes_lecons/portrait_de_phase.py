@@ -26,7 +26,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 from scipy.integrate import odeint # Pour la resolution d'equations differentielles
 
-from programmes_lecons import justify
+from programmes_lecons import justify, cached_text
 
 
 titre = "Portrait de phase d'un pendule"
@@ -82,7 +82,7 @@ def plot_static_data(ax, omega0):
 
 fig = plt.figure()
 fig.suptitle(titre)
-fig.text(0.5, .93, justify(description, 120), multialignment='left', verticalalignment='top', horizontalalignment='center')
+cached_text(fig, 0.5, .93, justify(description, 120), multialignment='left', verticalalignment='top', horizontalalignment='center')
 
 ax = fig.add_axes([0.1, 0.06, 0.8, 0.8])
 
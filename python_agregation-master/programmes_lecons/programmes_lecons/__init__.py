@@ -1,16 +1,74 @@
-""" Diverses fonctions récurentes dans les programmes des leçons"""
+""" Diverses fonctions récurentes dans les programmes des leçons
 
+Les sous-modules sont importés à la première utilisation d'un de leurs noms
+(PEP 562) : ``from programmes_lecons import justify`` ou
+``from programmes_lecons.constantes import c`` n'importent pas matplotlib.
+
+Le style ``lecons.mplstyle`` est appliqué à l'import des sous-modules qui
+créent des figures (widgets, text). Un programme qui n'utilise que
+``justify`` (ou aucune fonction) appelle ``programmes_lecons.apply_style()``
+avant de créer sa figure.
+"""
+
+import importlib
 import os
-import matplotlib.pyplot as plt
-from .utils import justify
-from .widgets import make_param_widgets, make_choose_plot, make_reset_button, make_log_button, make_start_stop_animation
-from .widgets import FloatSlider, IntSlider
 
 
 path = os.path.abspath(__file__)
 dir_path = os.path.dirname(path)
 
-plt.style.use(os.path.join(dir_path, 'lecons.mplstyle'))
+style_file = os.path.join(dir_path, 'lecons.mplstyle')
+
+# Nom public -> sous-module qui le définit
+_lazy_names = {
+    'justify':'utils',
+    'make_param_widgets':'widgets',
+    'make_choose_plot':'widgets',
+    'make_reset_button':'widgets',
+    'make_log_button':'widgets',
+    'make_start_stop_animation':'widgets',
+    'make_preset_buttons':'widgets',
+    'FloatSlider':'widgets',
+    'IntSlider':'widgets',
+    'BlitRenderer':'blit',
+    'AnimationClock':'clock',
+    'LineRegistry':'lines',
+    'CachedText':'text',
+    'cached_text':'text',
+    'save_figure':'export',
+    'memoize':'cache',
+    'build_table':'tables',
+    'load_table':'tables',
+}
+
+__all__ = list(_lazy_names)
+
+
+def __getattr__(name):
+    if name in _lazy_names:
+        module = importlib.import_module('.' + _lazy_names[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
+
+
+def apply_style():
+    """ Applique le style des leçons (importe matplotlib)"""
+    global _style_applied
+    import matplotlib.style
+    matplotlib.style.use(style_file)
+    _style_applied = True
 
 
+_style_applied = False
 
+def _apply_style_once():
+    # À l'import de widgets et text : ne défait pas les réglages faits par le
+    # programme après un premier apply_style
+    if not _style_applied:
+        apply_style()
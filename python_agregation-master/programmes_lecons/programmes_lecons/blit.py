@@ -0,0 +1,99 @@
+""" Rendu par "blitting" des programmes
+
+Lors d'une mise à jour, seules les données des lignes (le dictionnaire
+lines) changent. Plutôt que de redessiner toute la figure (axes,
+graduations, texte de description, sliders, ...), on garde une copie
+du fond statique et on ne redessine que les artistes qui bougent.
+
+Utilisation ::
+
+    renderer = BlitRenderer(fig, lines)
+    param_widgets = make_param_widgets(parameters, plot_data, slider_box=[...], renderer=renderer)
+
+Le fond est recapturé après chaque dessin complet de la figure
+(redimensionnement, changement d'échelle avec make_log_button, choix
+des courbes avec make_choose_plot, ...). Si plot_data modifie les limites
+ou l'échelle d'un axe (ax.set_xlim, ...), le fond est invalidé et la figure
+est entièrement redessinée.
+"""
+
+
+class BlitRenderer(object):
+    """ Redessine uniquement les artistes d'un dictionnaire de lignes
+
+    fig : la figure
+    lines : dictionnaire (ou liste) des artistes mis à jour par plot_data
+    """
+    def __init__(self, fig, lines=()):
+        self.fig = fig
+        self.canvas = fig.canvas
+        self.artists = []
+        self._background = None
+        self._view = None
+        if isinstance(lines, dict):
+            lines = lines.values()
+        for artist in lines:
+            self.add_artist(artist)
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+        self.canvas.mpl_connect('resize_event', lambda event: self.invalidate())
+
+    def add_artist(self, artist):
+        """ Ajoute un artiste redessiné à chaque mise à jour"""
+        if self.canvas.supports_blit:
+            # Sans blitting (GTK3Cairo, TkCairo, ...), un artiste animé ne
+            # serait jamais dessiné : il reste dans le dessin complet
+            artist.set_animated(True)
+        self.artists.append(artist)
+
+    def add_slider(self, slider):
+        """ Ajoute les parties mobiles d'un slider matplotlib"""
+        for name in ['poly', '_handle', 'valtext']:
+            artist = getattr(slider, name, None)
+            if artist is not None:
+                self.add_artist(artist)
+
+    def invalidate(self):
+        """ Oublie le fond : la prochaine mise à jour redessine toute la figure"""
+        self._background = None
+
+    def _view_state(self):
+        return [(ax.get_xlim(), ax.get_ylim(), ax.get_xscale(), ax.get_yscale())
+                for ax in self.fig.axes]
+
+    def _on_draw(self, event):
+        # Appelé à la fin de chaque dessin complet de la figure
+        if event is not None and event.canvas is not self.canvas:
+            # Export (savefig en pdf, ...) : la figure a temporairement un autre canvas
+            return
+        if not self.canvas.supports_blit:
+            return
+        if self.canvas.is_saving():
+            # savefig en png passe par le même canvas Agg : les artistes animés
+            # sont dessinés dans l'image, qui ne peut pas servir de fond
+            self.invalidate()
+            return
+        self._background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self._view = self._view_state()
+        self._draw_artists()
+
+    def _draw_artists(self):
+        for artist in self.artists:
+            self.fig.draw_artist(artist)
+
+    def draw(self):
+        """ Met à jour la figure à l'écran
+
+        Renvoie True si seuls les artistes ont été redessinés, False si un
+        dessin complet de la figure a été demandé.
+        """
+        if not self.canvas.supports_blit:
+            self.canvas.draw_idle()
+            return False
+        if self._background is None or self._view != self._view_state():
+            self.invalidate()
+            self.canvas.draw_idle()
+            return False
+        self.canvas.restore_region(self._background)
+        self._draw_artists()
+        self.canvas.blit(self.fig.bbox)
+        return True
@@ -0,0 +1,126 @@
+""" Mémoïsation des fonctions du modèle
+
+Lorsqu'on déplace un slider dans un sens puis dans l'autre, les mêmes
+courbes sont recalculées à chaque fois. Le décorateur memoize garde en
+mémoire les derniers résultats d'une fonction.
+
+Les valeurs des paramètres qui correspondent à un slider sont arrondies à
+la précision du slider (FloatSlider.precision) : deux valeurs indiscernables
+sur le slider donnent le même résultat. Le nombre de résultats gardés est
+limité (les moins récemment utilisés sont oubliés).
+
+Utilisation ::
+
+    @memoize(parameters, maxsize=64)
+    def loi_de_planck_lamb(T, lamb):
+        ...
+
+    loi_de_planck_lamb.cache_info()  # CacheInfo(hits=..., misses=..., maxsize=64, currsize=...)
+
+Une fonction mémoïsée peut être calculée dans un autre processus
+(make_param_widgets(..., background='process')) : le cache n'est pas
+partagé entre les processus.
+
+Attention : le même objet est renvoyé à chaque appel avec les mêmes
+arguments, il ne faut donc pas modifier les tableaux renvoyés.
+"""
+
+import functools
+import inspect
+import sys
+import threading
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+def memoize(parameters=None, maxsize=128):
+    """ Décorateur qui garde en mémoire les résultats d'une fonction
+
+    parameters : dictionnaire des widgets (FloatSlider, IntSlider). Les
+        arguments de même nom sont arrondis à la précision du widget.
+    maxsize : nombre maximal de résultats gardés en mémoire
+    """
+    def decorator(func):
+        return MemoizedFunction(func, parameters=parameters, maxsize=maxsize)
+    return decorator
+
+
+def _hashable(value):
+    if isinstance(value, np.ndarray):
+        return ('ndarray', value.shape, value.dtype.str, value.tobytes())
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(elm) for elm in value)
+    return value
+
+
+class MemoizedFunction(object):
+    """ Fonction dont les résultats sont gardés en mémoire (voir memoize)"""
+    def __init__(self, func, parameters=None, maxsize=128):
+        functools.update_wrapper(self, func)
+        self.func = func
+        self.parameters = parameters or {}
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._signature = inspect.signature(func)
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __call__(self, *args, **kwd):
+        bound = self._signature.bind(*args, **kwd)
+        bound.apply_defaults()
+        for name, value in bound.arguments.items():
+            if name in self.parameters:
+                bound.arguments[name] = self.parameters[name].quantize(value)
+        key = tuple((name, _hashable(value)) for name, value in bound.arguments.items())
+
+        with self._lock:
+            if key in self._cache:
+                self.hits += 1
+                self._cache.move_to_end(key)
+                return self._cache[key]
+            self.misses += 1
+
+        result = self.func(*bound.args, **bound.kwargs)
+
+        with self._lock:
+            self._cache[key] = result
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return result
+
+    def __reduce_ex__(self, protocol):
+        # Envoi à un autre processus (BackgroundWorker en mode 'process') :
+        # une fonction décorée au niveau d'un module est envoyée par son nom,
+        # comme une fonction ordinaire
+        module = sys.modules.get(self.__module__)
+        if getattr(module, self.__qualname__, None) is self:
+            return self.__qualname__
+        return super().__reduce_ex__(protocol)
+
+    def __getstate__(self):
+        # Le verrou ne peut pas être copié ; le cache reste dans ce processus
+        state = self.__dict__.copy()
+        del state['_lock']
+        state['_cache'] = OrderedDict()
+        state['hits'] = state['misses'] = 0
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def cache_info(self):
+        """ Statistiques d'utilisation du cache"""
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._cache))
+
+    def cache_clear(self):
+        """ Vide le cache et remet les statistiques à zéro"""
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
@@ -0,0 +1,121 @@
+""" Animation d'un paramètre à partir de l'horloge
+
+Les animations faites avec FuncAnimation qui appellent
+param_widgets['t'].set_val(...) passent par toute la machinerie du slider
+(évènements, dessin complet de la figure) et leur vitesse dépend du temps
+de calcul de chaque image.
+
+AnimationClock calcule le temps simulé à partir de l'heure réelle et
+appelle directement le modèle (avec le BlitRenderer éventuellement passé à
+make_param_widgets). Le slider n'est déplacé que pour indiquer la valeur
+courante, sans déclencher d'évènement.
+
+Avec fixed_step=True, le temps simulé avance par pas fixes (speed/fps) et
+reste calé sur l'heure réelle : si le calcul d'une image est trop long, les
+images en retard ne sont pas calculées (elles sont sautées) et comptées dans
+dropped. Les vitesses (de phase, de groupe, ...) restent ainsi correctes sur
+un ordinateur lent.
+
+Utilisation ::
+
+    ani = AnimationClock(param_widgets, 't', speed=1., period=10, fixed_step=True)
+    anim_btn = make_start_stop_animation(ani, start_animation=False)
+    print(ani.report())
+"""
+
+import time
+
+
+class AnimationClock(object):
+    """ Fait varier un paramètre proportionnellement au temps réel
+
+    param_widgets : les sliders (renvoyés par make_param_widgets)
+    key : nom du paramètre animé
+    speed : vitesse de variation du paramètre (unité du slider par seconde)
+    period : la valeur revient au minimum du slider après period (par défaut,
+        l'intervalle du slider)
+    fps : nombre d'images par seconde
+    fixed_step : le paramètre avance par pas fixes de speed/fps
+    start : démarrage immédiat de l'animation
+
+    Après l'animation, frames est le nombre d'images affichées et dropped le
+    nombre d'images sautées car l'affichage était en retard.
+    """
+    def __init__(self, param_widgets, key, speed=1., period=None, fps=30, fixed_step=False,
+                 start=False):
+        self.param_widgets = param_widgets
+        self.key = key
+        self.speed = speed
+        self.fps = fps
+        self.fixed_step = fixed_step
+        self.frames = 0
+        self.dropped = 0
+        self._frame = 0
+        widget = param_widgets[key]
+        self.t_min = widget.valmin
+        self.period = period if period is not None else widget.valmax - widget.valmin
+        fig = getattr(param_widgets, 'figure', None) or widget.ax.figure
+        self.timer = fig.canvas.new_timer(interval=int(1000/fps))
+        self.timer.add_callback(self._tick)
+        # Comme FuncAnimation : l'animation s'arrête quand la fenêtre est fermée
+        fig.canvas.mpl_connect('close_event', lambda event: self.stop())
+        self.running = False
+        self._t_start = None
+        self._wall_start = None
+        if start:
+            self.start()
+
+    @property
+    def event_source(self):
+        """ Le timer de l'animation (même nom que pour FuncAnimation)"""
+        return self.timer
+
+    def _frame_index(self):
+        return int(round((time.perf_counter() - self._wall_start)*self.fps))
+
+    def time(self, frame=None):
+        """ Valeur du paramètre à l'instant présent (ou pour l'image frame)
+
+        Si l'animation n'a pas démarré, l'image 0 correspond à la valeur
+        initiale du slider (et non à sa valeur actuelle, qui change quand on
+        affiche les images).
+        """
+        if frame is not None:
+            elapsed = frame/self.fps
+        else:
+            elapsed = time.perf_counter() - self._wall_start
+        t_start = self._t_start if self._t_start is not None else self.param_widgets[self.key].valinit
+        return self.t_min + (t_start - self.t_min + self.speed*elapsed) % self.period
+
+    def start(self):
+        """ Démarre l'animation à partir de la valeur actuelle du slider"""
+        self._t_start = self.param_widgets[self.key].val
+        self._wall_start = time.perf_counter()
+        self._frame = 0
+        self.running = True
+        self.timer.start()
+
+    def stop(self):
+        """ Arrête l'animation"""
+        self.running = False
+        self.timer.stop()
+
+    def report(self):
+        """ Nombre d'images affichées et sautées"""
+        total = self.frames + self.dropped
+        ratio = self.dropped/total if total else 0
+        return '{} images affichées, {} images sautées ({:.0%})'.format(self.frames, self.dropped, ratio)
+
+    def _tick(self):
+        if not self.running:
+            return
+        frame = self._frame_index()
+        if frame <= self._frame:
+            # L'image courante est déjà affichée (l'image 0 est l'état initial)
+            return
+        if frame > self._frame + 1:
+            self.dropped += frame - self._frame - 1
+        self._frame = frame
+        self.frames += 1
+        t = self.time(frame) if self.fixed_step else self.time()
+        self.param_widgets.show(**{self.key:t})
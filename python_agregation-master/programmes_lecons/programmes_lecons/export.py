@@ -0,0 +1,100 @@
+""" Export des figures en fichiers vectoriels légers
+
+Dans un pdf, chaque point d'une courbe (et chaque marqueur, chaque flèche)
+est écrit. Les courbes de plusieurs milliers de points, les nuages de
+points ou les champs de vecteurs donnent des fichiers gros et lents à
+afficher. save_figure :
+
+    * simplifie les chemins à la résolution de sortie (les points qui
+      s'écartent de moins de simplify_threshold pixels sont supprimés),
+    * dessine en image (rasterized) les artistes qui ont plus de
+      max_vertices sommets ; le texte et les axes restent vectoriels.
+
+Utilisation ::
+
+    size = save_figure(fig, 'figure.pdf')
+    print(format_size(size))
+"""
+
+import io
+import os
+
+import matplotlib as mpl
+from matplotlib.collections import Collection
+from matplotlib.lines import Line2D
+
+
+def vertex_count(artist):
+    """ Nombre de sommets écrits pour un artiste (après simplification)
+
+    Un marqueur compte pour le nombre de sommets de son dessin.
+    """
+    if isinstance(artist, Line2D):
+        count = 0
+        if artist.get_linestyle() not in ['None', ' ', '']:
+            path = artist.get_path()
+            if mpl.rcParams['path.simplify'] and path.should_simplify:
+                path = path.cleaned(transform=artist.get_transform(), simplify=True)
+            count += len(path.vertices)
+        if artist.get_marker() not in [None, 'None', ' ', '']:
+            marker_path = artist._marker.get_path()
+            count += len(artist.get_xydata())*len(marker_path.vertices)
+        return count
+    if isinstance(artist, Collection):
+        paths = artist.get_paths()
+        count = sum(len(path.vertices) for path in paths)
+        offsets = artist.get_offsets()
+        if len(paths) == 1 and len(offsets) > 1:
+            # Un même marqueur répété (scatter)
+            count *= len(offsets)
+        return count
+    return 0
+
+
+def dense_artists(fig, max_vertices):
+    """ Artistes des axes qui ont plus de max_vertices sommets"""
+    return [artist for ax in fig.axes for artist in ax.get_children()
+            if artist.get_visible() and vertex_count(artist) > max_vertices]
+
+
+def save_figure(fig, filename, max_vertices=2000, simplify_threshold=0.5, dpi=150, **kwd):
+    """ Enregistre la figure en simplifiant et en rastérisant les artistes denses
+
+    max_vertices : nombre de sommets au delà duquel un artiste est dessiné
+        en image (None : jamais)
+    simplify_threshold : écart maximal (en pixels) lors de la simplification
+        des chemins
+    dpi : résolution des parties en image
+
+    Si le fichier est plus petit sans image (la zone rastérisée est grande
+    par rapport au nombre de sommets), la version entièrement vectorielle est
+    gardée. Renvoie la taille du fichier (en octets).
+    """
+    kwd.setdefault('format', os.path.splitext(filename)[1][1:] or None)
+    with mpl.rc_context({'path.simplify':True, 'path.simplify_threshold':simplify_threshold}):
+        artists = dense_artists(fig, max_vertices) if max_vertices is not None else []
+        vector = io.BytesIO()
+        fig.savefig(vector, dpi=dpi, **kwd)
+        data = vector.getvalue()
+        if artists:
+            rasterized = [artist.get_rasterized() for artist in artists]
+            for artist in artists:
+                artist.set_rasterized(True)
+            try:
+                mixed = io.BytesIO()
+                fig.savefig(mixed, dpi=dpi, **kwd)
+            finally:
+                for artist, state in zip(artists, rasterized):
+                    artist.set_rasterized(state)
+            if len(mixed.getvalue()) < len(data):
+                data = mixed.getvalue()
+    with open(filename, 'wb') as f:
+        f.write(data)
+    return len(data)
+
+
+def format_size(size):
+    """ Taille lisible (ko, Mo)"""
+    if size < 1E6:
+        return '{:.0f} ko'.format(size/1E3)
+    return '{:.1f} Mo'.format(size/1E6)
@@ -0,0 +1,199 @@
+""" Mesure du temps de mise à jour des figures
+
+Pour savoir où passe le temps lors d'une interaction, on mesure pour
+chaque mise à jour :
+
+    * le temps entre deux évènements (slider ou animation),
+    * le temps de calcul du modèle, s'il est calculé en arrière plan,
+    * le temps passé dans plot_data (et dans le modèle sinon),
+    * le temps de dessin de la figure,
+    * la latence : temps entre le premier évènement et la fin du dessin.
+
+Un texte en bas à droite de la figure affiche le nombre d'images par
+seconde et les latences médiane (p50) et p99. Les mesures brutes sont
+enregistrées dans un fichier CSV à la fermeture de la fenêtre (ou à la fin
+du programme).
+
+On l'active sans modifier les programmes avec la variable d'environnement
+PROGRAMMES_LECONS_INSTRUMENT (nom du fichier CSV, ou 1 pour n'avoir que
+l'affichage) ::
+
+    PROGRAMMES_LECONS_INSTRUMENT=timings.csv python effet_tunnel.py
+"""
+
+import atexit
+import contextlib
+import csv
+import os
+import time
+import weakref
+
+import numpy as np
+
+
+ENVIRON_KEY = 'PROGRAMMES_LECONS_INSTRUMENT'
+
+# figure -> référence faible vers son instrumentation (que la figure garde en
+# vie par fig.draw) : l'instrumentation, qui référence la figure, ne doit pas
+# la garder en vie
+_instrumentations = weakref.WeakKeyDictionary()
+
+
+def get_instrumentation(fig, instrument=None):
+    """ Renvoie l'instrumentation de la figure (ou None)
+
+    instrument : None (utilise la variable d'environnement), False (pas de
+        mesure), True ou nom du fichier CSV
+    """
+    instrumentation = _instrumentations[fig]() if fig in _instrumentations else None
+    if instrumentation is not None:
+        return instrumentation
+    if instrument is None:
+        instrument = os.environ.get(ENVIRON_KEY, '')
+        if instrument in ['', '0']:
+            return None
+        if instrument == '1':
+            instrument = True
+    if not instrument:
+        return None
+    csv_file = None if instrument is True else instrument
+    instrumentation = Instrumentation(fig, csv_file=csv_file)
+    _instrumentations[fig] = weakref.ref(instrumentation)
+    return instrumentation
+
+
+def _percentile(data, q):
+    data = [elm for elm in data if elm is not None]
+    if not data:
+        return float('nan')
+    return np.percentile(data, q)
+
+
+class Instrumentation(object):
+    """ Enregistre la durée des étapes de chaque mise à jour d'une figure
+
+    fig : la figure
+    csv_file : fichier dans lequel enregistrer les mesures à la fermeture
+    overlay : affichage des statistiques sur la figure
+    window : nombre de mises à jour utilisées pour les statistiques
+    """
+    fields = ['time', 'source', 'event_interval', 'model', 'plot_data', 'draw', 'latency']
+
+    def __init__(self, fig, csv_file=None, overlay=True, window=100):
+        self.fig = fig
+        self.csv_file = csv_file
+        self.window = window
+        self.records = []
+        self._t0 = time.perf_counter()
+        self._last_event = None
+        self._pending_since = None
+        self._source = None
+        self._interval = None
+        self._animating = False
+        self._animation = None
+
+        self.overlay = None
+        if overlay:
+            self.overlay = fig.text(0.99, 0.005, '', horizontalalignment='right',
+                                    verticalalignment='bottom', fontsize=9, family='monospace')
+
+        # Mesure du temps de dessin complet de la figure
+        figure_draw = fig.draw
+        def draw(renderer):
+            t = time.perf_counter()
+            figure_draw(renderer)
+            self.drawn(time.perf_counter()-t)
+        fig.draw = draw
+
+        fig.canvas.mpl_connect('close_event', lambda event: self.save())
+        # Sans fenêtre (backend Agg, ...), il n'y a pas d'évènement de fermeture.
+        # Référence faible : la figure et ses mesures peuvent être libérées avant
+        save = weakref.WeakMethod(self.save)
+        atexit.register(lambda: save() is not None and save()())
+
+    def event(self, source='slider'):
+        """ Un évènement (mouvement d'un slider, pas d'animation, ...)"""
+        if self._animating:
+            # Le slider est déplacé par l'animation : l'évènement est déjà compté
+            return
+        now = time.perf_counter()
+        if self._last_event is not None:
+            self._interval = now - self._last_event
+        self._last_event = now
+        self._source = source
+        if self._pending_since is None:
+            self._pending_since = now
+
+    def watch_animation(self, anim):
+        """ Enregistre les pas d'une animation (FuncAnimation ou AnimationClock)"""
+        self._animation = anim
+        def start_tick():
+            self.event('animation')
+            self._animating = True
+        def end_tick():
+            self._animating = False
+        anim.event_source.callbacks.insert(0, (start_tick, (), {}))
+        anim.event_source.add_callback(end_tick)
+
+    @contextlib.contextmanager
+    def measure(self, name='plot_data'):
+        """ Mesure la durée d'une étape d'une nouvelle mise à jour"""
+        record = dict.fromkeys(self.fields)
+        record['source'] = self._source
+        record['event_interval'] = self._interval
+        t = time.perf_counter()
+        record['time'] = t - self._t0
+        yield record
+        record[name] = time.perf_counter() - t
+        self.records.append(record)
+
+    def drawn(self, duration):
+        """ Fin du dessin de la figure (durée en secondes)"""
+        now = time.perf_counter()
+        if self.records and self.records[-1]['draw'] is None:
+            record = self.records[-1]
+            record['draw'] = duration
+            if self._pending_since is not None:
+                record['latency'] = now - self._pending_since
+        self._pending_since = None
+        self.update_overlay()
+
+    def statistics(self):
+        """ Statistiques sur les dernières mises à jour (durées en secondes)"""
+        records = [elm for elm in self.records[-self.window:] if elm['draw'] is not None]
+        stat = {'fps':float('nan')}
+        if len(records) > 1:
+            duration = records[-1]['time'] - records[0]['time']
+            if duration > 0:
+                stat['fps'] = (len(records)-1)/duration
+        for name in ['latency', 'plot_data', 'draw']:
+            data = [elm[name] for elm in records]
+            stat[name+'_p50'] = _percentile(data, 50)
+            stat[name+'_p99'] = _percentile(data, 99)
+        return stat
+
+    def update_overlay(self):
+        if self.overlay is None:
+            return
+        stat = self.statistics()
+        text = '{fps:5.1f} fps | latence p50 {p50:6.1f} ms p99 {p99:6.1f} ms'.format(
+            fps=stat['fps'], p50=stat['latency_p50']*1E3, p99=stat['latency_p99']*1E3)
+        dropped = getattr(self._animation, 'dropped', None)
+        if dropped is not None:
+            text += ' | {} images sautées'.format(dropped)
+        self.overlay.set_text(text)
+
+    def save(self, csv_file=None):
+        """ Enregistre les mesures brutes (durées en ms)"""
+        csv_file = csv_file or self.csv_file
+        if csv_file is None:
+            return
+        with open(csv_file, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['time (s)', 'source'] + [name + ' (ms)' for name in self.fields[2:]])
+            for record in self.records:
+                row = [record['time'], record['source']]
+                for name in self.fields[2:]:
+                    value = record[name]
+                    row.append('' if value is None else value*1E3)
+                writer.writerow(row)
@@ -0,0 +1,69 @@
+""" Dictionnaire des lignes avec calcul à la demande
+
+Avec make_choose_plot, certaines courbes sont cachées. Il est inutile de
+les calculer à chaque mise à jour. Un LineRegistry est un dictionnaire de
+lignes (comme le dictionnaire lines des programmes) qui connaît, pour
+chaque ligne, la fonction qui calcule ses données. Seules les lignes
+visibles sont calculées ; une ligne cachée est calculée lorsqu'elle est
+affichée.
+
+Utilisation ::
+
+    def courbe_forme(x, b, lamb, D):
+        return x, forme(x, b, lamb, D)
+
+    def plot_data(...):
+        lines.update_data(x=x, b=b, lamb=lamb, D=D)
+
+    lines = LineRegistry(producers={'Facteur de forme':courbe_forme})
+    lines['Facteur de forme'], = ax.plot([], [], visible=False)
+
+Les fonctions reçoivent les arguments nommés de update_data (elles peuvent
+n'en utiliser qu'une partie) et renvoient les arguments de set_data.
+"""
+
+import inspect
+
+
+class LineRegistry(dict):
+    """ Dictionnaire des lignes qui calcule uniquement les lignes visibles
+
+    producers : dictionnaire clé de la ligne -> fonction calculant ses données
+    """
+    def __init__(self, *args, producers=None, **kwd):
+        super().__init__(*args, **kwd)
+        self.producers = {}
+        self._values = None
+        self._stale = set()
+        for key, func in (producers or {}).items():
+            self.add_producer(key, func)
+
+    def add_producer(self, key, func):
+        """ Associe à la ligne key la fonction qui calcule ses données"""
+        self.producers[key] = func
+        self._stale.add(key)
+
+    def _compute(self, key):
+        func = self.producers[key]
+        parameters = inspect.signature(func).parameters
+        if any(elm.kind == elm.VAR_KEYWORD for elm in parameters.values()):
+            args = self._values
+        else:
+            args = {name:val for name, val in self._values.items() if name in parameters}
+        self[key].set_data(*func(**args))
+        self._stale.discard(key)
+
+    def update_data(self, **values):
+        """ Met à jour les lignes visibles avec les paramètres values"""
+        self._values = values
+        for key in self.producers:
+            if self[key].get_visible():
+                self._compute(key)
+            else:
+                self._stale.add(key)
+
+    def set_visible(self, key, state):
+        """ Affiche ou cache une ligne (ses données sont calculées si besoin)"""
+        if state and key in self._stale and self._values is not None:
+            self._compute(key)
+        self[key].set_visible(state)
@@ -0,0 +1,137 @@
+""" Calcul des courbes d'un programme sans interface graphique
+
+Le programme est exécuté sans créer de widgets (mode headless de
+make_param_widgets) ni dessiner de figure. Le modèle et plot_data sont
+appelés pour chaque jeu de paramètres et les données de toutes les lignes
+(dictionnaire lines) sont enregistrées dans un fichier .npz compressé ::
+
+    python -m programmes_lecons.run diffraction_N_fentes --param a=2 --param N=10
+    python -m programmes_lecons.run effet_tunnel --param-file jeux.json -o tunnel.npz
+
+Le fichier de paramètres (JSON) contient une liste de dictionnaires de
+paramètres ; les paramètres absents prennent la valeur initiale du slider.
+Pour le jeu i, les données de la ligne key sont dans les tableaux
+'i/key/x' et 'i/key/y' ; les valeurs du paramètre name dans 'params/name'.
+"""
+
+import argparse
+import ast
+import json
+import os
+import runpy
+import sys
+
+programmes_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def find_program(name):
+    """ Chemin du fichier d'un programme (nom ou chemin)"""
+    for filename in [name, name + '.py', os.path.join(programmes_dir, name),
+                     os.path.join(programmes_dir, name + '.py')]:
+        if os.path.isfile(filename):
+            return os.path.abspath(filename)
+    raise FileNotFoundError('Programme "{}" introuvable'.format(name))
+
+
+def load_program(name, all_lines=True):
+    """ Exécute un programme sans widgets et renvoie son espace de noms
+
+    all_lines : les courbes cachées d'un LineRegistry sont aussi calculées
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    from . import widgets
+    from .lines import LineRegistry
+    filename = find_program(name)
+    widgets.headless = True
+    cwd = os.getcwd()
+    # Les programmes lisent leurs fichiers de données dans leur répertoire
+    os.chdir(os.path.dirname(filename))
+    try:
+        namespace = runpy.run_path(filename, run_name='programme_' + os.path.splitext(os.path.basename(filename))[0])
+    finally:
+        os.chdir(cwd)
+        widgets.headless = False
+    lines = namespace.get('lines', {})
+    if all_lines and isinstance(lines, LineRegistry):
+        # Sans interface, toutes les courbes sont calculées
+        for key in lines.producers:
+            lines[key].set_visible(True)
+    return namespace
+
+
+def evaluate(namespace, **values):
+    """ Calcule les lignes pour les paramètres values
+
+    Renvoie un dictionnaire clé de la ligne -> (x, y).
+    """
+    import numpy as np
+    param_widgets = namespace.get('param_widgets')
+    if param_widgets is not None:
+        param_widgets.show(**values)
+    elif values:
+        raise ValueError("Le programme n'a pas de paramètres")
+    data = {}
+    for key, line in namespace.get('lines', {}).items():
+        if hasattr(line, 'get_data'):
+            x, y = line.get_data()
+            data[key] = (np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+    return data
+
+
+def parse_param(text):
+    """ 'a=2' -> ('a', 2)"""
+    key, sep, value = text.partition('=')
+    if not sep:
+        raise argparse.ArgumentTypeError('Paramètre "{}" : utiliser nom=valeur'.format(text))
+    try:
+        value = ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        raise argparse.ArgumentTypeError('Valeur du paramètre "{}" non valide'.format(text))
+    return key.strip(), value
+
+
+def main(argv=None):
+    import numpy as np
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('program', help='nom ou fichier du programme')
+    parser.add_argument('--param', type=parse_param, action='append', default=[],
+                        help='valeur d\'un paramètre (nom=valeur)')
+    parser.add_argument('--param-file', help='fichier JSON contenant une liste de jeux de paramètres')
+    parser.add_argument('-o', '--output', help='fichier .npz (par défaut <programme>.npz)')
+    args = parser.parse_args(argv)
+
+    namespace = load_program(args.program)
+    parameters = namespace.get('parameters', {})
+    common = dict(args.param)
+    if args.param_file:
+        with open(args.param_file) as f:
+            sets = [dict(elm, **common) for elm in json.load(f)]
+    else:
+        sets = [common]
+    for values in sets:
+        unknown = set(values) - set(parameters)
+        if unknown:
+            parser.error('Paramètres inconnus : {}'.format(', '.join(sorted(unknown))))
+
+    # Les paramètres absents d'un jeu reprennent leur valeur initiale (et non
+    # celle du jeu précédent)
+    param_widgets = namespace.get('param_widgets')
+    defaults = {key:widget.valinit for key, widget in param_widgets.items()} if param_widgets is not None else {}
+    sets = [dict(defaults, **values) for values in sets]
+
+    arrays = {}
+    for i, values in enumerate(sets):
+        for key, (x, y) in evaluate(namespace, **values).items():
+            arrays['{}/{}/x'.format(i, key)] = x
+            arrays['{}/{}/y'.format(i, key)] = y
+    for name in defaults:
+        arrays['params/{}'.format(name)] = np.array([values[name] for values in sets])
+
+    output = args.output or os.path.splitext(os.path.basename(find_program(args.program)))[0] + '.npz'
+    np.savez_compressed(output, **arrays)
+    print('{} jeu(x) de paramètres, {} tableaux enregistrés dans {}'.format(len(sets), len(arrays), output))
+
+
+if __name__=='__main__':
+    sys.exit(main())
@@ -0,0 +1,74 @@
+""" Regroupement des mises à jour des widgets
+
+Lorsqu'on déplace un slider, matplotlib envoie un évènement pour chaque
+mouvement de la souris. Si on recalcule et redessine la figure à chaque
+évènement, les calculs s'accumulent et l'affichage prend du retard sur
+la souris.
+
+La classe UpdateScheduler garde uniquement les dernières valeurs demandées
+et effectue une seule mise à jour, au plus max_fps fois par seconde.
+"""
+
+import time
+
+from matplotlib.backend_bases import TimerBase
+
+
+class UpdateScheduler(object):
+    """ Regroupe les demandes de mise à jour d'une figure
+
+    fig : la figure (son canvas fournit le timer)
+    callback : fonction appelée avec le dictionnaire des dernières valeurs
+    max_fps : nombre maximal de mises à jour par seconde (None : pas de limite)
+    """
+    def __init__(self, fig, callback, max_fps=30):
+        self.fig = fig
+        self.callback = callback
+        self.min_interval = 1./max_fps if max_fps else 0
+        self._pending = None
+        self._last_update = 0.
+        self._timer_running = False
+        self._timer = fig.canvas.new_timer()
+        self._timer.single_shot = True
+        self._timer.add_callback(self._on_timer)
+        # Sans boucle d'évènements (backend Agg, pdf, ...) le timer ne se
+        # déclenche jamais : on fait alors la mise à jour immédiatement.
+        self.immediate = type(self._timer) is TimerBase
+
+    def request(self, values):
+        """ Demande une mise à jour avec les valeurs values
+
+        Les demandes successives avant la mise à jour sont fusionnées : seules
+        les dernières valeurs sont utilisées.
+        """
+        self._pending = values
+        if self.immediate:
+            self.flush()
+            return
+        if self._timer_running:
+            return
+        delay = self._last_update + self.min_interval - time.perf_counter()
+        # Le timer est toujours utilisé (même avec un délai nul) pour laisser
+        # la boucle d'évènements traiter les évènements en attente.
+        self._timer.interval = max(0, int(delay*1000))
+        self._timer_running = True
+        self._timer.start()
+
+    def _on_timer(self):
+        self._timer_running = False
+        self.flush()
+
+    def flush(self):
+        """ Effectue immédiatement la mise à jour en attente (s'il y en a une)"""
+        if self._pending is None:
+            return
+        values, self._pending = self._pending, None
+        self._last_update = time.perf_counter()
+        self.callback(values)
+
+    def cancel(self):
+        """ Annule la mise à jour en attente"""
+        self._pending = None
+        if self._timer_running:
+            self._timer.stop()
+            self._timer_running = False
@@ -0,0 +1,142 @@
+""" Tables de valeurs précalculées
+
+Lorsque le calcul du modèle est beaucoup trop long pour être fait à
+chaque mouvement d'un slider, on peut le précalculer une fois pour
+toutes sur une grille de paramètres (entre les min et max de chaque
+slider) et l'enregistrer dans un fichier. Pendant la leçon, les valeurs
+sont alors interpolées à partir de la table (c'est ce qui est fait à la
+main dans van_der_waals avec van_der_waals_precalc_data.json).
+
+Création de la table (une seule fois) ::
+
+    table = build_table(modele, parameters, 'modele_table.npz', points=30)
+    print(table.report())
+
+Utilisation dans le programme ::
+
+    modele = load_table('modele_table.npz')
+    y = modele(a=1.2, b=3)
+
+La fonction doit renvoyer un nombre ou un tableau dont la forme ne dépend
+pas des paramètres. L'erreur d'interpolation est estimée au centre de
+cellules de la grille tirées au hasard et enregistrée avec la table.
+"""
+
+import itertools
+
+import numpy as np
+
+from .widgets import IntSlider
+
+
+def _grid(widget, points):
+    if isinstance(widget, IntSlider):
+        grid = np.arange(widget.min, widget.max+1)
+        if len(grid) > points:
+            grid = np.unique(np.round(np.linspace(widget.min, widget.max, points)))
+        return grid.astype(float)
+    return np.linspace(widget.min, widget.max, points)
+
+
+def build_table(func, parameters, filename=None, points=20, n_check=50, **fixed):
+    """ Calcule func sur une grille de paramètres et enregistre la table
+
+    func : fonction appelée avec les paramètres comme arguments nommés
+    parameters : dictionnaire des sliders (les bornes de la grille sont leurs min et max)
+    filename : fichier .npz où enregistrer la table (None : pas d'enregistrement)
+    points : nombre de points par paramètre (entier ou dictionnaire), au moins 2
+    n_check : nombre de points utilisés pour estimer l'erreur d'interpolation
+    fixed : autres arguments de func, identiques pour toute la table
+    """
+    names = list(parameters.keys())
+    if not isinstance(points, dict):
+        points = {name:points for name in names}
+    axes = [_grid(parameters[name], points[name]) for name in names]
+    for name, axis in zip(names, axes):
+        # Avec un seul point, le paramètre serait ignoré par la table (et
+        # l'erreur estimée ne le verrait pas)
+        if len(axis) < 2 and parameters[name].max > parameters[name].min:
+            raise ValueError('Il faut au moins 2 points pour le paramètre "{}"'.format(name))
+
+    values = [np.asarray(func(**dict(zip(names, point)), **fixed), dtype=float)
+              for point in itertools.product(*axes)]
+    values = np.array(values).reshape(tuple(len(axis) for axis in axes) + values[0].shape)
+    table = LookupTable(names, axes, values)
+
+    # Estimation de l'erreur au centre de cellules de la grille tirées au hasard
+    rng = np.random.default_rng(0)
+    err_abs = 0.
+    scale = np.max(np.abs(values)) or 1.
+    for _ in range(n_check):
+        point = {}
+        for name, axis in zip(names, axes):
+            if len(axis) > 1 and not isinstance(parameters[name], IntSlider):
+                i = rng.integers(len(axis)-1)
+                point[name] = (axis[i] + axis[i+1])/2
+            else:
+                point[name] = rng.choice(axis)
+        exact = np.asarray(func(**point, **fixed), dtype=float)
+        err_abs = max(err_abs, np.max(np.abs(table(**point) - exact)))
+    table.error = {'abs':float(err_abs), 'rel':float(err_abs/scale)}
+
+    if filename is not None:
+        table.save(filename)
+    return table
+
+
+def load_table(filename):
+    """ Charge une table enregistrée par build_table"""
+    return LookupTable.load(filename)
+
+
+class LookupTable(object):
+    """ Table de valeurs interpolée (voir build_table)
+
+    Un appel table(**params) renvoie la valeur interpolée linéairement.
+    Les paramètres en dehors de la grille sont ramenés sur ses bords.
+    """
+    def __init__(self, names, axes, values, error=None):
+        from scipy.interpolate import RegularGridInterpolator
+        self.names = list(names)
+        self.axes = [np.asarray(axis, dtype=float) for axis in axes]
+        self.values = np.asarray(values)
+        self.error = error
+        shape = tuple(len(axis) for axis in self.axes)
+        self.output_shape = self.values.shape[len(shape):]
+        # Les axes de longueur 1 ne sont pas interpolés
+        self._interp_axes = [i for i, axis in enumerate(self.axes) if len(axis) > 1]
+        values = self.values.reshape(shape + (-1,))
+        values = values[tuple(slice(None) if i in self._interp_axes else 0 for i in range(len(shape)))]
+        self._interpolator = RegularGridInterpolator([self.axes[i] for i in self._interp_axes], values)
+
+    def __call__(self, **params):
+        point = []
+        for i in self._interp_axes:
+            axis = self.axes[i]
+            point.append(np.clip(params[self.names[i]], axis[0], axis[-1]))
+        return self._interpolator([point])[0].reshape(self.output_shape)
+
+    def save(self, filename):
+        """ Enregistre la table dans un fichier .npz"""
+        error = self.error or {}
+        data = {'axis_{}'.format(i):axis for i, axis in enumerate(self.axes)}
+        np.savez_compressed(filename, names=np.array(self.names), values=self.values,
+                            error_abs=error.get('abs', np.nan), error_rel=error.get('rel', np.nan),
+                            **data)
+
+    @classmethod
+    def load(cls, filename):
+        """ Charge une table depuis un fichier .npz"""
+        with np.load(filename) as data:
+            names = [str(name) for name in data['names']]
+            axes = [data['axis_{}'.format(i)] for i in range(len(names))]
+            error = {'abs':float(data['error_abs']), 'rel':float(data['error_rel'])}
+            return cls(names, axes, data['values'], error=error)
+
+    def report(self):
+        """ Résumé de la table (taille de la grille et erreur d'interpolation)"""
+        grid = ' x '.join('{}:{}'.format(name, len(axis)) for name, axis in zip(self.names, self.axes))
+        out = 'Table {} ({} valeurs)'.format(grid, self.values.size)
+        if self.error is not None:
+            out += ' -- erreur max : {abs:.3g} (relative : {rel:.2%})'.format(**self.error)
+        return out
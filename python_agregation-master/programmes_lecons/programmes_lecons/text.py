@@ -0,0 +1,84 @@
+""" Texte mis en cache sous forme d'image
+
+Les descriptions des programmes (souvent avec des formules en mathtext)
+sont mises en page et dessinées à chaque dessin complet de la figure. Avec
+CachedText, le texte est dessiné une seule fois pour une résolution (dpi)
+et une taille de figure données ; l'image obtenue est ensuite simplement
+recopiée.
+
+Utilisation (remplace fig.text) ::
+
+    cached_text(fig, 0.02, .9, justify(description), multialignment='left', verticalalignment='top')
+
+Le cache n'est utilisé que pour les images (backend Agg) : dans un fichier
+pdf ou svg, le texte reste vectoriel.
+"""
+
+import numpy as np
+from matplotlib.backends.backend_agg import RendererAgg
+from matplotlib.colors import to_rgba
+from matplotlib.text import Text
+
+from . import _apply_style_once
+
+# Style des leçons, avant la création de la première figure
+_apply_style_once()
+
+
+class CachedText(Text):
+    """ Text dont le rendu Agg est gardé en mémoire"""
+    def __init__(self, *args, **kwd):
+        super().__init__(*args, **kwd)
+        self._raster = None
+        self._raster_key = None
+
+    def _cache_key(self, renderer):
+        position = self.get_transform().transform(self.get_unitless_position())
+        return (renderer.dpi, renderer.get_canvas_width_height(), tuple(position),
+                self.get_text(), hash(self.get_fontproperties()), to_rgba(self.get_color()),
+                self.get_alpha(), self.get_horizontalalignment(), self.get_verticalalignment(),
+                self._multialignment, self.get_rotation(), self._linespacing, self.get_usetex())
+
+    def _rasterize(self, renderer):
+        # Dessin dans une image transparente de la taille de la figure, dont
+        # on ne garde que le rectangle contenant le texte
+        width, height = renderer.get_canvas_width_height()
+        width, height = int(width), int(height)
+        offscreen = RendererAgg(width, height, renderer.dpi)
+        super().draw(offscreen)
+        self._renderer = renderer
+        bbox = self.get_window_extent(offscreen)
+        x0 = max(int(np.floor(bbox.x0)) - 2, 0)
+        y0 = max(int(np.floor(bbox.y0)) - 2, 0)
+        x1 = min(int(np.ceil(bbox.x1)) + 2, width)
+        y1 = min(int(np.ceil(bbox.y1)) + 2, height)
+        if x1 <= x0 or y1 <= y0:
+            return None
+        # Les lignes du tampon vont du haut vers le bas, celles de draw_image
+        # du bas vers le haut
+        image = np.asarray(offscreen.buffer_rgba())[height-y1:height-y0, x0:x1][::-1].copy()
+        return x0, y0, image
+
+    def draw(self, renderer):
+        if (not isinstance(renderer, RendererAgg) or not self.get_visible() or
+                self.get_text() == '' or self.get_bbox_patch() is not None or
+                self.get_path_effects()):
+            return super().draw(renderer)
+        key = self._cache_key(renderer)
+        if key != self._raster_key:
+            self._raster = self._rasterize(renderer)
+            self._raster_key = key
+        if self._raster is not None:
+            x0, y0, image = self._raster
+            gc = renderer.new_gc()
+            self._set_gc_clip(gc)
+            renderer.draw_image(gc, x0, y0, image)
+            gc.restore()
+        self.stale = False
+
+
+def cached_text(fig, x, y, s, **kwd):
+    """ Comme fig.text, mais le texte est dessiné une seule fois (voir CachedText)"""
+    text = CachedText(x, y, s, **kwd)
+    fig.add_artist(text)
+    return text
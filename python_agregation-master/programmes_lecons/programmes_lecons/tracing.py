@@ -0,0 +1,139 @@
+""" Traces des évènements au format "Chrome trace event"
+
+Pour comprendre comment s'enchaînent les évènements des sliders, les
+appels à plot_data, les dessins de la figure et les pas d'une animation,
+on enregistre chaque étape avec sa date de début et sa durée. Le fichier
+JSON obtenu s'ouvre avec un visualiseur de traces (chrome://tracing,
+https://ui.perfetto.dev, ...).
+
+Chaque évènement est associé au nom du programme (catégorie et nom du
+processus) et, pour plot_data et le modèle, aux valeurs des paramètres.
+
+On l'active avec la variable d'environnement PROGRAMMES_LECONS_TRACE ::
+
+    PROGRAMMES_LECONS_TRACE=trace.json python propagation_son.py
+"""
+
+import atexit
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+import weakref
+
+
+ENVIRON_KEY = 'PROGRAMMES_LECONS_TRACE'
+
+# figure -> référence faible vers son traceur (gardé en vie par fig.draw),
+# comme pour l'instrumentation
+_tracers = weakref.WeakKeyDictionary()
+
+
+def get_tracer(fig, trace=None):
+    """ Renvoie le traceur de la figure (ou None)
+
+    trace : None (utilise la variable d'environnement), False (pas de
+        trace) ou nom du fichier JSON
+    """
+    tracer = _tracers[fig]() if fig in _tracers else None
+    if tracer is not None:
+        return tracer
+    if trace is None:
+        trace = os.environ.get(ENVIRON_KEY, '')
+    if not trace:
+        return None
+    tracer = Tracer(fig, trace)
+    _tracers[fig] = weakref.ref(tracer)
+    return tracer
+
+
+def _program_name():
+    name = os.path.splitext(os.path.basename(sys.argv[0]))[0]
+    return name or 'python'
+
+
+def _jsonable(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return str(value)
+
+
+class Tracer(object):
+    """ Enregistre des évènements au format Chrome trace event
+
+    fig : la figure tracée
+    filename : fichier JSON écrit à la fermeture de la fenêtre (ou à la
+        fin du programme)
+    program : nom du programme (par défaut le nom du script)
+    """
+    def __init__(self, fig, filename, program=None):
+        self.fig = fig
+        self.filename = filename
+        self.program = program or _program_name()
+        self.events = []
+        self._t0 = time.perf_counter()
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._add({'name':'process_name', 'ph':'M', 'args':{'name':self.program}})
+
+        # Dessin complet de la figure
+        figure_draw = fig.draw
+        def draw(renderer):
+            with self.span('draw'):
+                figure_draw(renderer)
+        fig.draw = draw
+
+        fig.canvas.mpl_connect('close_event', lambda event: self.save())
+        save = weakref.WeakMethod(self.save)
+        atexit.register(lambda: save() is not None and save()())
+
+    def _now(self):
+        return (time.perf_counter() - self._t0)*1E6 # en µs
+
+    def _add(self, event):
+        event.setdefault('pid', self._pid)
+        event.setdefault('tid', threading.get_ident())
+        event.setdefault('cat', self.program)
+        with self._lock:
+            self.events.append(event)
+
+    @contextlib.contextmanager
+    def span(self, name, **args):
+        """ Enregistre la durée du bloc"""
+        ts = self._now()
+        try:
+            yield
+        finally:
+            self._add({'name':name, 'ph':'X', 'ts':ts, 'dur':self._now()-ts,
+                       'args':{key:_jsonable(val) for key, val in args.items()}})
+
+    def begin(self, name, **args):
+        """ Début d'une étape (terminée par end)"""
+        self._add({'name':name, 'ph':'B', 'ts':self._now(),
+                   'args':{key:_jsonable(val) for key, val in args.items()}})
+
+    def end(self, name):
+        """ Fin d'une étape commencée par begin"""
+        self._add({'name':name, 'ph':'E', 'ts':self._now()})
+
+    def instant(self, name, **args):
+        """ Évènement ponctuel"""
+        self._add({'name':name, 'ph':'i', 's':'t', 'ts':self._now(),
+                   'args':{key:_jsonable(val) for key, val in args.items()}})
+
+    def watch_animation(self, anim):
+        """ Enregistre les pas d'une animation (FuncAnimation)"""
+        anim.event_source.callbacks.insert(0, (self.begin, ('animation_tick',), {}))
+        anim.event_source.add_callback(self.end, 'animation_tick')
+
+    def save(self, filename=None):
+        """ Écrit la trace dans un fichier JSON"""
+        filename = filename or self.filename
+        with self._lock:
+            events = list(self.events)
+        with open(filename, 'w') as f:
+            json.dump({'traceEvents':events, 'displayTimeUnit':'ms',
+                       'otherData':{'program':self.program}}, f)
@@ -10,14 +10,41 @@ Des fonctions :
     make_param_widgets, 
     make_choose_plot, 
     make_reset_button, 
+    make_preset_buttons,
     make_log_button,
     make_start_stop_animation
 
 """
 
+import contextlib
+import functools
+import inspect
+import time
+
 import matplotlib.pyplot as plt
 from matplotlib.widgets import Slider, Button, RadioButtons, CheckButtons
 
+from .scheduler import UpdateScheduler
+from .worker import BackgroundWorker
+from .instrumentation import get_instrumentation
+from .tracing import get_tracer
+from .lines import LineRegistry
+from .clock import AnimationClock
+from . import _apply_style_once
+
+# Style des leçons, avant la création de la première figure
+_apply_style_once()
+
+class QuietSlider(Slider):
+    """ Slider qui ne redessine pas la figure lui même
+
+    Le dessin est fait une seule fois par mise à jour par make_param_widgets.
+    Avec un backend sans fenêtre (Agg, pdf), draw_idle dessine immédiatement
+    toute la figure : un Slider ordinaire la dessinerait dès sa création.
+    """
+    drawon = False
+
+
 class Widget(object):
     value = None
     description = ""
@@ -30,18 +57,34 @@ class Widget(object):
 class FloatSlider(Widget):
     min = 0
     max = 1
+    step = None
+
+    @property
+    def precision(self):
+        """ Plus petite variation significative du paramètre"""
+        if self.step is not None:
+            return self.step
+        return (self.max - self.min)/1000.
+
+    def quantize(self, value):
+        """ Arrondi de value à la résolution du slider"""
+        return self.min + round((value - self.min)/self.precision)*self.precision
 
     def make_mpl_widget(self, ax, update):
-        w = Slider(ax, self.description, self.min, self.max, valinit=self.value)
+        w = QuietSlider(ax, self.description, self.min, self.max, valinit=self.value, valstep=self.step)
         w.on_changed(update)
         return w
 
 class IntSlider(Widget):
     min = 1
     max = 10
+    precision = 1
+
+    def quantize(self, value):
+        return int(round(value))
 
     def make_mpl_widget(self, ax, update):
-        w = Slider(ax, self.description, self.min, self.max, valinit=self.value, valstep=1)
+        w = QuietSlider(ax, self.description, self.min, self.max, valinit=self.value, valstep=1)
         w.on_changed(update)
         return w
 
@@ -58,33 +101,271 @@ class IntSlider(Widget):
 
 slider_color = 'lightgoldenrodyellow'
 
+# Mode sans widgets (voir programmes_lecons.run) : make_param_widgets ne crée
+# pas de sliders et les autres fonctions make_* ne créent rien
+headless = False
+
+
+class HeadlessSlider(object):
+    """ Remplace un slider matplotlib en mode sans widgets"""
+    def __init__(self, widget):
+        self.valmin = widget.min
+        self.valmax = widget.max
+        self.valinit = widget.value
+        self.val = widget.value
+        self.eventson = True
+
+    def set_val(self, val):
+        self.val = val
+
+    def reset(self):
+        self.val = self.valinit
+
+
+class ParamWidgets(dict):
+    """ Dictionnaire des sliders renvoyé par make_param_widgets
+
+    Permet de modifier plusieurs paramètres en une seule mise à jour
+    (un seul calcul du modèle et un seul dessin) ::
+
+        with param_widgets.hold():
+            param_widgets['a'].set_val(2)
+            param_widgets['N'].set_val(10)
+
+        param_widgets.set_values(a=2, N=10)
+        param_widgets.reset()
 
-def make_param_widgets(parameters, plot_data, slider_box):
+    show permet à une animation (voir AnimationClock) de mettre à jour la
+    figure sans passer par les évènements des sliders.
+    """
+    def __init__(self, update, flush, render=None, progressive=False, figure=None):
+        super().__init__()
+        self.figure = figure
+        self._update = update
+        self._flush = flush
+        self._render = render
+        self._progressive = progressive
+        self._held = 0
+        self._changed = False
+
+    @property
+    def held(self):
+        """ Vrai pendant une modification groupée"""
+        return self._held > 0
+
+    def changed(self):
+        """ Un slider a changé pendant une modification groupée"""
+        self._changed = True
+
+    @contextlib.contextmanager
+    def hold(self):
+        """ Groupe les modifications des sliders en une seule mise à jour"""
+        self._held += 1
+        try:
+            yield self
+        finally:
+            self._held -= 1
+            if self._held == 0 and self._changed:
+                self._changed = False
+                self._update()
+                self._flush()
+
+    def set_values(self, **values):
+        """ Modifie plusieurs paramètres en une seule mise à jour"""
+        with self.hold():
+            for key, val in values.items():
+                self[key].set_val(val)
+
+    def reset(self):
+        """ Remet tous les paramètres à leur valeur initiale"""
+        with self.hold():
+            for widget in self.values():
+                widget.reset()
+
+    def show(self, **values):
+        """ Calcule et dessine directement la figure pour les valeurs values
+
+        Les sliders sont seulement déplacés (sans évènement) pour indiquer
+        la valeur courante.
+        """
+        for key, val in values.items():
+            widget = self[key]
+            eventson = widget.eventson
+            widget.eventson = False
+            try:
+                widget.set_val(val)
+            finally:
+                widget.eventson = eventson
+        current = {key:widget.val for key, widget in self.items()}
+        if self._progressive:
+            current['resolution'] = 1
+        self._render(current)
+
+
+def _timed_model(model, **values):
+    """ Résultat du modèle et durée du calcul"""
+    t = time.perf_counter()
+    result = model(**values)
+    return result, time.perf_counter() - t
+
+
+def make_param_widgets(parameters, plot_data, slider_box, max_fps=30, renderer=None,
+                       model=None, background=None, progressive=None, instrument=None,
+                       trace=None):
     """ Crée automatiquement les widget matplotlib
 
     parameters : dictionnaire contenant les parameters
     plot_data : callback fonction
     slider_box : boite dans laquelle mettre les sliders
+    max_fps : nombre maximal de mises à jour par seconde. Les évènements
+        des sliders arrivant entre deux mises à jour sont regroupés et
+        seules les dernières valeurs sont utilisées.
+    renderer : None (toute la figure est redessinée) ou un BlitRenderer
+        qui ne redessine que les lignes et les sliders
+    model : None ou fonction appelée avec les paramètres et qui renvoie un
+        dictionnaire. plot_data est alors appelée avec ce dictionnaire comme
+        arguments nommés : model fait les calculs, plot_data met à jour la figure.
+    background : None (calcul du modèle dans la boucle d'évènements), 'thread'
+        ou 'process' (calcul en arrière plan, voir BackgroundWorker)
+    progressive : None ou résolution (entre 0 et 1, True pour 0.25) utilisée
+        pendant qu'un slider est déplacé à la souris. La fonction de calcul
+        (model ou plot_data) reçoit alors un argument resolution : une
+        fraction du nombre de points à calculer. Un calcul à pleine
+        résolution (resolution=1) est fait lorsque le slider est relâché.
+    instrument : mesure des temps de mise à jour (voir Instrumentation).
+        None : selon la variable d'environnement PROGRAMMES_LECONS_INSTRUMENT,
+        True, False ou nom du fichier CSV
+    trace : trace des évènements au format Chrome (voir Tracer). None : selon
+        la variable d'environnement PROGRAMMES_LECONS_TRACE, False ou nom du
+        fichier JSON
+
+    En mode sans widgets (headless), aucun slider n'est créé et rien n'est
+    calculé : param_widgets.show(**values) calcule et met à jour les lignes,
+    sans dessiner la figure.
     """
     f = plt.gcf()
+    if headless:
+        def compute(values):
+            plot_data(**(values if model is None else model(**values)))
+        mpl_widgets = ParamWidgets(lambda: None, lambda: None, compute, progressive=bool(progressive),
+                                   figure=f)
+        for key, elm in parameters.items():
+            mpl_widgets[key] = HeadlessSlider(elm)
+        return mpl_widgets
+
     n = len(parameters)
     x0, y0, W, H = slider_box
     height = H/n
 
-    def update(val=None):
+    instrumentation = get_instrumentation(f, instrument)
+    if instrumentation is not None and renderer is not None and instrumentation.overlay is not None:
+        renderer.add_artist(instrumentation.overlay)
+    tracer = get_tracer(f, trace)
+
+    @contextlib.contextmanager
+    def stage(name, values):
+        """ Mesure et trace une étape de la mise à jour (renvoie la mesure ou None)"""
+        with contextlib.ExitStack() as stack:
+            record = None
+            if instrumentation is not None:
+                record = stack.enter_context(instrumentation.measure(name))
+            if tracer is not None:
+                stack.enter_context(tracer.span(name, **values))
+            yield record
+
+    def draw():
+        if renderer is None:
+            if tracer is not None:
+                tracer.instant('draw_idle')
+            f.canvas.draw_idle()
+        else:
+            t = time.perf_counter()
+            with (tracer.span('blit') if tracer is not None else contextlib.nullcontext()):
+                blitted = renderer.draw()
+            if blitted and instrumentation is not None:
+                instrumentation.drawn(time.perf_counter() - t)
+
+    def apply(values, result):
+        model_time = None
+        if instrumentation is not None:
+            result, model_time = result
+        with stage('plot_data', values) as record:
+            plot_data(**result)
+        if record is not None:
+            record['model'] = model_time
+        draw()
+
+    if model is None:
+        def render(values):
+            with stage('plot_data', values):
+                plot_data(**values)
+            draw()
+    elif background is None:
+        def render(values):
+            with stage('plot_data', values):
+                plot_data(**model(**values))
+            draw()
+    else:
+        if tracer is not None and background == 'thread':
+            traced_model = model
+            def model(**values):
+                with tracer.span('model', **values):
+                    return traced_model(**values)
+        if instrumentation is not None:
+            # La durée du calcul est mesurée là où il est fait (thread ou processus)
+            model = functools.partial(_timed_model, model)
+        worker = BackgroundWorker(f, model, apply, executor=background)
+        def render(values):
+            worker.submit(values)
+            # Les sliders sont redessinés sans attendre la fin du calcul
+            draw()
+
+    scheduler = UpdateScheduler(f, render, max_fps=max_fps)
+
+    if progressive is True:
+        progressive = 0.25
+    if progressive:
+        compute = plot_data if model is None else model
+        if 'resolution' not in inspect.signature(compute).parameters:
+            raise Exception('La fonction "{f.__name__}" doit avoir un argument "resolution"'.format(f=compute))
+    coarse = [False]  # La dernière mise à jour était-elle à basse résolution ?
+
+    def update(val=None, key=None, released=False):
+        if mpl_widgets.held:
+            mpl_widgets.changed()
+            return
+        if instrumentation is not None:
+            instrumentation.event('slider')
+        if tracer is not None and key is not None:
+            tracer.instant('slider', parameter=key, value=val)
         values = {}
         for key, w in mpl_widgets.items():
             values[key] = w.val
-        plot_data(**values)
-        plt.draw()
+        if progressive:
+            # Sans boucle d'évènements, il n'y a pas de glisser-déposer
+            dragging = not (released or scheduler.immediate) and \
+                any(getattr(w, 'drag_active', False) for w in mpl_widgets.values())
+            coarse[0] = dragging
+            values['resolution'] = progressive if dragging else 1
+        scheduler.request(values)
+
+    def on_release(event):
+        if coarse[0]:
+            update(released=True)
+
+    if progressive:
+        f.canvas.mpl_connect('button_release_event', on_release)
 
 
 #    default = {key:val.value for key, val in parameters.items()}
-    mpl_widgets = {}
+    mpl_widgets = ParamWidgets(update, scheduler.flush, render, progressive=bool(progressive), figure=f)
     for i, (key, elm) in enumerate(parameters.items()):
         ax = f.add_axes([x0, y0+height*i, W, height], facecolor=slider_color)
-        mpl_widgets[key] = elm.make_mpl_widget(ax, update)        
+        mpl_widgets[key] = elm.make_mpl_widget(ax, functools.partial(update, key=key))
+        if renderer is not None:
+            renderer.add_slider(mpl_widgets[key])
     update()
+    scheduler.flush()
 
     return mpl_widgets
     
@@ -97,7 +378,11 @@ def make_choose_plot(lines, box, which=None):
     which : by default (None) : all the plots
         otherwise : key of the lines 
             or tuple of keys (one button for many lines)
+
+    If lines is a LineRegistry, hidden lines are computed when shown.
     """
+    if headless:
+        return None
     f = plt.gcf()
     ax = f.add_axes(box, facecolor=slider_color)
 
@@ -113,15 +398,21 @@ def make_choose_plot(lines, box, which=None):
         is_active.append(elm.get_visible())
     choose_widget = CheckButtons(ax, labels, is_active)
 
+    def set_visible(key, state):
+        if isinstance(lines, LineRegistry):
+            lines.set_visible(key, state)
+        else:
+            lines[key].set_visible(state)
+
     def chooseplot(label):
         states = choose_widget.get_status() 
         for i, key in enumerate(which):
             state = states[i]
             if isinstance(key, tuple):
                 for k in key:
-                    lines[k].set_visible(state)
+                    set_visible(k, state)
             else:
-                lines[key].set_visible(state)            
+                set_visible(key, state)
         f.canvas.draw_idle()
 
     choose_widget.on_clicked(chooseplot)
@@ -129,25 +420,53 @@ def make_choose_plot(lines, box, which=None):
     return choose_widget
 
 def make_reset_button(mpl_widgets, box=[0.8, 0.005, 0.1, 0.04]):
+    if headless:
+        return None
     f = plt.gcf()
     ax = f.add_axes(box, facecolor=slider_color)
 
     button = Button(ax, 'Reset', color=slider_color, hovercolor='0.975')
 
     def reset(event):
-        for widget in mpl_widgets.values():
-            widget.reset() 
+        if isinstance(mpl_widgets, ParamWidgets):
+            mpl_widgets.reset() # Une seule mise à jour pour tous les sliders
+        else:
+            for widget in mpl_widgets.values():
+                widget.reset() 
 
     button.on_clicked(reset) # Lorsqu'on clique sur "reset", on applique la fonction reset definie au dessus
 
     return button
 
+def make_preset_buttons(mpl_widgets, presets, box=[0.015, 0.05, 0.12, 0.15]):
+    """ Boutons pour choisir des valeurs prédéfinies des paramètres
+
+    mpl_widgets : les sliders (renvoyés par make_param_widgets)
+    presets : dictionnaire nom -> dictionnaire des valeurs des paramètres
+    """
+    if headless:
+        return None
+    f = plt.gcf()
+    x0, y0, W, H = box
+    height = H/len(presets)
+
+    buttons = []
+    for i, (label, values) in enumerate(presets.items()):
+        ax = f.add_axes([x0, y0+H-height*(i+1), W, height], facecolor=slider_color)
+        button = Button(ax, label, color=slider_color, hovercolor='0.975')
+        button.on_clicked(lambda event, values=values: mpl_widgets.set_values(**values))
+        buttons.append(button)
+
+    return buttons
+
 def make_log_button(ax, box=[0.015, 0.05, 0.12, 0.15], ylims=None):
     """ Make a log button
 
     ax : the axis
     ylims : None or dictionary with the ylim for 'linear' and 'log' scales
     """
+    if headless:
+        return None
     f = plt.gcf()
     ax_btn = f.add_axes(box, facecolor=slider_color)
 
@@ -173,8 +492,21 @@ def make_log_button(ax, box=[0.015, 0.05, 0.12, 0.15], ylims=None):
 
     return widget
 
-def make_start_stop_animation(anim, box=[0.015, 0.05, 0.12, 0.1], start_animation=True):
+def make_start_stop_animation(anim, box=[0.015, 0.05, 0.12, 0.1], start_animation=True, instrument=None,
+                              trace=None):
+    """ Case à cocher pour démarrer et arrêter une animation
+
+    anim : FuncAnimation ou AnimationClock
+    """
+    if headless:
+        return None
     f = plt.gcf()
+    instrumentation = get_instrumentation(f, instrument)
+    if instrumentation is not None:
+        instrumentation.watch_animation(anim)
+    tracer = get_tracer(f, trace)
+    if tracer is not None:
+        tracer.watch_animation(anim)
     ax_btn = f.add_axes(box, facecolor=slider_color)
 
     labels = ['anim']
@@ -183,10 +515,17 @@ def make_start_stop_animation(anim, box=[0.015, 0.05, 0.12, 0.1], start_animatio
     def set_anim(label):
         if widget.get_status()[0]:
             print('on')
-            anim.event_source.start()
+            if isinstance(anim, AnimationClock):
+                anim.start()
+            else:
+                anim.event_source.start()
         else:
             print('off')
-            anim.event_source.stop()
+            if isinstance(anim, AnimationClock):
+                anim.stop()
+                print(anim.report())
+            else:
+                anim.event_source.stop()
 
     widget.on_clicked(set_anim)
 
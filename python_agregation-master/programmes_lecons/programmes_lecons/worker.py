@@ -0,0 +1,96 @@
+""" Calcul du modèle en arrière plan
+
+Certains modèles sont longs à calculer (résolution d'équations
+différentielles, grilles denses, ...). S'ils sont calculés dans la
+boucle d'évènements de matplotlib, l'interface est bloquée pendant le
+calcul.
+
+La classe BackgroundWorker calcule le modèle dans un thread (ou un
+processus) et applique le résultat dans le thread de l'interface
+graphique. Un seul calcul est en cours à la fois : si les paramètres ont
+changé pendant le calcul, le résultat, périmé, est abandonné et le calcul
+est relancé avec les dernières valeurs.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from matplotlib.backend_bases import TimerBase
+
+
+class BackgroundWorker(object):
+    """ Calcule un modèle en arrière plan
+
+    fig : la figure (son canvas fournit le timer)
+    model : fonction appelée avec les paramètres comme arguments nommés
+    apply : fonction appelée dans le thread graphique avec (values, result)
+    executor : 'thread' ou 'process'. Avec 'process', le modèle doit pouvoir
+        être envoyé à un autre processus (fonction définie au niveau d'un
+        module).
+    poll_interval : intervalle (en ms) de vérification de la fin du calcul
+    """
+    def __init__(self, fig, model, apply, executor='thread', poll_interval=20):
+        self.model = model
+        self.apply = apply
+        if executor == 'thread':
+            self.executor = ThreadPoolExecutor(max_workers=1)
+        elif executor == 'process':
+            self.executor = ProcessPoolExecutor(max_workers=1)
+        else:
+            raise Exception('Executor "{}" non valide'.format(executor))
+        self.generation = 0
+        self.dropped = 0
+        self._latest = None
+        self._job = None
+        self._timer = fig.canvas.new_timer(interval=poll_interval)
+        self._timer.add_callback(self._poll)
+        self.immediate = type(self._timer) is TimerBase
+        fig.canvas.mpl_connect('close_event', lambda event: self.shutdown())
+
+    def submit(self, values):
+        """ Demande le calcul du modèle avec les paramètres values"""
+        self.generation += 1
+        self._latest = (self.generation, values)
+        if self.immediate:
+            self._latest = None
+            self.apply(values, self.model(**values))
+            return
+        if self._job is None:
+            self._start()
+
+    def _start(self):
+        generation, values = self._latest
+        self._latest = None
+        future = self.executor.submit(self.model, **values)
+        self._job = (generation, values, future)
+        self._timer.start()
+
+    def _poll(self):
+        if self._job is None:
+            self._timer.stop()
+            return
+        generation, values, future = self._job
+        if not future.done():
+            return
+        self._job = None
+        try:
+            if generation == self.generation:
+                self.apply(values, future.result())
+            else:
+                # Des valeurs plus récentes ont été demandées pendant le calcul
+                self.dropped += 1
+        finally:
+            if self._latest is not None:
+                self._start()
+            else:
+                self._timer.stop()
+
+    @property
+    def busy(self):
+        """ Vrai si un calcul est en cours"""
+        return self._job is not None
+
+    def shutdown(self):
+        """ Arrête le calcul en arrière plan"""
+        self._timer.stop()
+        self._latest = None
+        self.executor.shutdown(wait=False)
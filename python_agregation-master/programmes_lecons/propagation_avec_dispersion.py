@@ -25,7 +25,6 @@ Liste des modifications :
 """
 
 import matplotlib.pyplot as plt
-from matplotlib import animation
 import numpy as np
 from numpy import exp, cos, pi
 
@@ -33,6 +32,7 @@ from numpy import exp, cos, pi
 from programmes_lecons import FloatSlider, IntSlider
 from programmes_lecons import make_param_widgets, make_choose_plot, make_reset_button, make_start_stop_animation
 from programmes_lecons import justify
+from programmes_lecons import BlitRenderer, AnimationClock
 
 
 
@@ -85,8 +85,9 @@ x = np.linspace(Xmin, Xmax, NbEchantillons) # x est ici un array en ligne
 #===========================================================
 
 # La fonction plot_data est appelée à chaque modification des paramètres
-def plot_data(t):
+def plot_data(t, resolution=1):
     att = 1+(t/tau)**2
+    x = np.linspace(Xmin, Xmax, int(NbEchantillons*resolution)) # Moins de points pendant le déplacement du slider
     lines['courbe'].set_data(x, amplitude(t, x))
 
     lines['enveloppes_p'].set_data(x, enveloppe(t, x))
@@ -123,7 +124,9 @@ lines['points_vg'], = ax.plot([], [], 'ro')  # point rouge avançant à vg
 lines['points_vphi'], = ax.plot([], [], 'bo') # point bleu avançant à vphi
 
 
-param_widgets = make_param_widgets(parameters, plot_data, slider_box=[0.08+0.84*2/12, 0.01, 0.84*10/12, 0.05])
+renderer = BlitRenderer(fig, lines)
+param_widgets = make_param_widgets(parameters, plot_data, slider_box=[0.08+0.84*2/12, 0.01, 0.84*10/12, 0.05], progressive=True,
+                                   renderer=renderer)
 
 #===========================================================
 # --- Animation --------------------------------------------
@@ -131,14 +134,8 @@ param_widgets = make_param_widgets(parameters, plot_data, slider_box=[0.08+0.84*
 
 start_animation = False # Est-ce que l'animation se lance automatiquement ? 
 
-def animation_function(val):
-    param_widgets['t'].set_val((val/10)%10)
-    # Astuce permettant de stopper l'animation tout de suite
-    if val==0 and start_animation==False:
-        ani.event_source.stop()
-    return lines.values()
-
-ani = animation.FuncAnimation(fig, animation_function, interval=100.0)
+# Le temps avance d'une unité par seconde
+ani = AnimationClock(param_widgets, 't', speed=1., fixed_step=True, start=start_animation)
 anim_btn = make_start_stop_animation(ani, box=[0.01, 0.01, 0.07, 0.1], start_animation=start_animation)
 
 if __name__=="__main__":
@@ -24,11 +24,11 @@ Liste des modifications :
 import numpy as np
 from numpy import pi, exp
 import matplotlib.pyplot as plt
-import matplotlib.animation as animation
 
 from programmes_lecons import FloatSlider, IntSlider
 from programmes_lecons import make_param_widgets, make_choose_plot, make_reset_button, make_start_stop_animation
-from programmes_lecons import justify
+from programmes_lecons import justify, cached_text
+from programmes_lecons import BlitRenderer, AnimationClock
 
 
 titre = 'Reflexion des ondes sonores planes harmoniques propagatives'
@@ -81,15 +81,13 @@ def plot_data(t, freq, amp, Z2):
     lines['coef_refl'].set_text('r = {:4.2f}; t = {:4.2f}'.format(refl, 1+refl))
     lines['Z2'].set_text('$Z_2={:4.2f}$'.format(Z2))
 
-    fig.canvas.draw_idle()
-
 #===========================================================
 # --- Création de la figure et mise en page ----------------
 #===========================================================
 
 fig = plt.figure()
 fig.suptitle(titre)
-fig.text(0.02, .9, justify(description), multialignment='left', verticalalignment='top')
+cached_text(fig, 0.02, .9, justify(description), multialignment='left', verticalalignment='top')
 
 ax = fig.add_axes([0.35, 0.3, 0.6, 0.6])
 
@@ -108,17 +106,16 @@ ax.set_ylim(-10, 10)
 ax.axvline(0, linestyle='--', color='k')
 
 
-param_widgets = make_param_widgets(parameters, plot_data, slider_box=[0.45, 0.07, 0.4, 0.15])
+renderer = BlitRenderer(fig, lines)
+param_widgets = make_param_widgets(parameters, plot_data, slider_box=[0.45, 0.07, 0.4, 0.15], renderer=renderer)
 reset_button = make_reset_button(param_widgets)
 
 #===========================================================
 # --- Animation --------------------------------------------
 #===========================================================
 
-def animation_function(val):
-    param_widgets['t'].set_val((val/50)%1)
-
-ani = animation.FuncAnimation(fig, animation_function, interval=100.0)
+# Le temps avance de 0.2 ms par seconde et revient à 0 après 1 ms
+ani = AnimationClock(param_widgets, 't', speed=0.2, period=1, start=True)
 anim_btn = make_start_stop_animation(ani)
 
 
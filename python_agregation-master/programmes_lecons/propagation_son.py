@@ -49,11 +49,11 @@ description = """Ce programme représente les positions d'un ensemble de poussi
 import numpy as np
 from numpy import pi
 import matplotlib.pyplot as plt
-import matplotlib.animation as animation
 
 from programmes_lecons import FloatSlider, IntSlider
 from programmes_lecons import make_param_widgets, make_choose_plot, make_reset_button, make_start_stop_animation
-from programmes_lecons import justify
+from programmes_lecons import justify, cached_text
+from programmes_lecons import BlitRenderer, AnimationClock
 
 
 #===========================================================
@@ -105,8 +105,6 @@ def plot_data(L, T):
     lines['pression'].set_data(x_graph, onde_pression(x_graph, AP,  T))
     lines['vitesse'].set_data(x_graph, onde_vitesse(x_graph, Av, T))
 
-    fig.canvas.draw_idle()
-
 
 #===========================================================
 # --- Création de la figure et mise en page ----------------
@@ -114,7 +112,7 @@ def plot_data(L, T):
 
 fig = plt.figure()
 fig.suptitle(titre)
-fig.text(0.5, .93, description, multialignment='left', verticalalignment='top', horizontalalignment='center')
+cached_text(fig, 0.5, .93, description, multialignment='left', verticalalignment='top', horizontalalignment='center')
 
 ax1, ax2, ax3 = fig.subplots(3, 1, sharex=True,
             gridspec_kw={'left':0.1, 'bottom':0.25, 'top':0.9, 'hspace':0.05})
@@ -147,7 +145,8 @@ part_x, part_y = np.random.rand(2, n)
 x_graph = np.linspace(0, 1, 1001)
 
 
-param_widgets = make_param_widgets(parameters, plot_data, slider_box=[0.35, 0.07, 0.4, 0.10])
+renderer = BlitRenderer(fig, lines)
+param_widgets = make_param_widgets(parameters, plot_data, slider_box=[0.35, 0.07, 0.4, 0.10], renderer=renderer)
 reset_button = make_reset_button(param_widgets)
 
 #===========================================================
@@ -156,13 +155,8 @@ reset_button = make_reset_button(param_widgets)
 
 start_animation = False # Est-ce que l'animation se lance automatiquement ? 
 
-def animation_function(val):
-    param_widgets['T'].set_val((val/100)%1)
-    if val==0 and start_animation==False:
-        ani.event_source.stop()
-    return lines.values()
-
-ani = animation.FuncAnimation(fig, animation_function, interval=100.0)
+# Le temps avance de 0.1 ms par seconde
+ani = AnimationClock(param_widgets, 'T', speed=0.1, fixed_step=True, start=start_animation)
 anim_btn = make_start_stop_animation(ani, start_animation=start_animation)
 
 if __name__=='__main__':
@@ -16,20 +16,22 @@ Informations
 ------------
 Auteurs : Arnaud Raoux, François Lévrier, Emmanuel Baudin, Pierre Cladé et la prépa agreg de Montrouge
 Année de création : 2016 
-Version : 1.1
+Version : 1.2
 Version de Python : 3.6
 Licence : Creative Commons Attribution - Pas d'utilisation Commerciale 4.0 International
 
 Liste des modifications :
     * v 1.00 : 2016-03-01 Première version complète
     * v 1.1 : 2019-05-10 supression des variables globales
+    * v 1.2 : 2026-10-18 Ajout des sliders L et Vo, calcul des états propres en arrière plan
 """
 
 from pylab import *
 from scipy.integrate import odeint # Pour la resolution d'equations differentielles
 from scipy.optimize import brentq # Pour trouver les zeros d'une fonction
 
-import programmes_lecons
+from programmes_lecons import FloatSlider, memoize
+from programmes_lecons import make_param_widgets, make_reset_button
 
 titre = """Puits quantique"""
 
@@ -49,6 +51,11 @@ x = linspace(-b, b, N)    # abscisses
 L = 1                     # largeur du puits
 dx = x[1] - x[0]
 
+parameters = dict(
+    L = FloatSlider(value=L, min=0.2, max=1.5, description='Largeur du puits -- $L$'),
+    Vo = FloatSlider(value=Vo, min=5, max=60, description='Hauteur du puits -- $V_0$'),
+)
+
 #===========================================================
 # --- Modèle physique --------------------------------------
 #===========================================================
@@ -101,20 +108,48 @@ celles dont la fonction d'onde vaut 0 loin à l'interieur du puits (en x=b).
 # --- Réalisation du plot ----------------------------------
 #===========================================================
 
-# La fonction plot_data est appelée à chaque modification des paramètres
-def plot_data(ax1, ax2, L=L, Vo=Vo):
+@memoize(parameters, maxsize=32)
+def etats_propres(L=L, Vo=Vo):
+    """Calcule les énergies propres et les fonctions d'onde normalisées
+
+Ce calcul est long : il est effectué en arrière plan (voir make_param_widgets).
+    """
     en = linspace(0.1, Vo, 100)   # Energies que l'on va investiger pour trouver les etats propres
     E_zeroes = find_all_zeroes(en, L, Vo) # On ne selectionne que les energies telles que la fonction d'onde vaut 0 en x=b
-    for E in E_zeroes:
-        ax2.plot(linspace(-L, L, 50), E*ones(50), label="E = %.2f"%E)
-    ax2.legend()
-
-    ## Fonctions d'onde
+    psis = []
     for E in E_zeroes:
         psi = wave_function(E, L, Vo)
         norm2 = np.sum(psi**2*dx)
-        psi = psi/np.sqrt(norm2)
-        ax1.plot(x, psi[:,0], label="E = %.2f"%E)
+        psis.append(psi[:,0]/np.sqrt(norm2))
+    return dict(L=L, Vo=Vo, energies=E_zeroes, psis=psis)
+
+# La fonction plot_data est appelée avec le résultat de etats_propres
+def plot_data(L, Vo, energies, psis):
+    ## Dessin du puits
+    lines['puits'].set_data(x, np.vectorize(V)(x, L, Vo))
+    for s, bord in zip([-1, 1, -1, 1], bords):
+        bord.set_xdata([s*L, s*L])
+    ax2.set_ylim(-0.1*Vo,1.2*Vo)
+
+    for i, (E, psi) in enumerate(zip(energies, psis)):
+        if 'niveau_{}'.format(i) not in lines:
+            # Les lignes d'un nouvel état sont créées une fois pour toutes
+            color = 'C{}'.format(i%10)
+            lines['niveau_{}'.format(i)], = ax2.plot([], [], color=color)
+            lines['psi_{}'.format(i)], = ax1.plot([], [], color=color)
+        lines['niveau_{}'.format(i)].set_data(linspace(-L, L, 50), E*ones(50))
+        ## Fonctions d'onde
+        lines['psi_{}'.format(i)].set_data(x, psi)
+        for key in ['niveau_{}'.format(i), 'psi_{}'.format(i)]:
+            lines[key].set_label("E = %.2f"%E)
+    # Les états en trop (pour les paramètres précédents) sont vidés
+    i = len(energies)
+    while 'niveau_{}'.format(i) in lines:
+        for key in ['niveau_{}'.format(i), 'psi_{}'.format(i)]:
+            lines[key].set_data([], [])
+            lines[key].set_label('_nolegend_')
+        i += 1
+    ax2.legend()
 
 
 #===========================================================
@@ -125,17 +160,18 @@ fig = plt.figure()
 fig.suptitle(titre)
 #fig.text(0.5, .93, description, multialignment='left', verticalalignment='top', horizontalalignment='center')
 
-ax1, ax2 = fig.subplots(2, sharex=True) # La figure sera composee de deux sous-figures
+ax1, ax2 = fig.subplots(2, sharex=True, gridspec_kw={'bottom':0.25}) # La figure sera composee de deux sous-figures
 
 ## ax2 : Energies
 ax2.set_title(r'Énergies propres')
-ax2.set_ylim(-0.1*Vo,1.2*Vo)
 ax2.set_ylabel('$E$')
 ax2.set_xlim(-2,2)
 ax2.set_xlabel('$x/L$')
 
-## Dessin du puits
-ax2.plot(x, np.vectorize(V)(x, L, Vo), linewidth=2, color='k')
+lines = {}
+lines['puits'], = ax2.plot([], [], linewidth=2, color='k')
+# Les niveaux d'énergie (niveau_i) et les fonctions d'onde (psi_i) sont
+# ajoutés à lines par plot_data
 
 ## ax1 : Fonctions d'onde
 ax1.set_title("Fonctions d'onde propres")
@@ -143,13 +179,14 @@ ax1.set_ylim(-.5,1)
 ax1.set_ylabel('$\Psi(x)$')
 
 ## Pointilles
+bords = []
 for ax in [ax1, ax2]:
     for s in [-1, 1]:
-        ax.axvline(s*L, color='k', linestyle='--')
+        bords.append(ax.axvline(s*L, color='k', linestyle='--'))
 
-plot_data(ax1, ax2)
+param_widgets = make_param_widgets(parameters, plot_data, slider_box=[0.35, 0.05, 0.4, 0.1],
+                                   model=etats_propres, background='thread')
+reset_button = make_reset_button(param_widgets)
 
 if __name__=="__main__":
     plt.show()
-
-
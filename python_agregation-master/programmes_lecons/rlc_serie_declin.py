@@ -29,7 +29,7 @@ import numpy as np
 
 from programmes_lecons import FloatSlider, IntSlider
 from programmes_lecons import make_param_widgets, make_choose_plot, make_reset_button, make_log_button
-from programmes_lecons import justify
+from programmes_lecons import justify, cached_text
 
 titre = "Réponse à un échelon de tension d'un circuit RLC série"
 
@@ -98,8 +98,6 @@ def plot_data(R, L, C):
     lines['L'].set_data(t*1E3, resonance_L(R, L, C, t))
     lines['C'].set_data(t*1E3, resonance_C(R, L, C, t))
 
-    fig.canvas.draw_idle()
-
 
 #===========================================================
 # --- Création de la figure et mise en page ----------------
@@ -107,7 +105,7 @@ def plot_data(R, L, C):
 
 fig = plt.figure()
 fig.suptitle(titre)
-fig.text(0.02, .9, justify(description), multialignment='left', verticalalignment='top')
+cached_text(fig, 0.02, .9, justify(description), multialignment='left', verticalalignment='top')
 
 ax = fig.add_axes([0.35, 0.3, 0.6, 0.6])
 ax.axhline(0, color='k')
@@ -28,8 +28,8 @@ import numpy as np
 from numpy import pi
 
 from programmes_lecons import FloatSlider, IntSlider
-from programmes_lecons import make_param_widgets, make_choose_plot, make_reset_button, make_log_button
-from programmes_lecons import justify
+from programmes_lecons import make_param_widgets, make_choose_plot, make_reset_button, make_log_button, BlitRenderer
+from programmes_lecons import justify, cached_text
 
 titre = "Résonance en tension d'un circuit RLC série"
 
@@ -89,8 +89,6 @@ def plot_data(R, L, C):
     lines['C - phi'].set_data(freq, np.angle(resonance_C(R, L, C, freq), deg=True))
 
 
-    fig.canvas.draw_idle()
-
 
 #===========================================================
 # --- Création de la figure et mise en page ----------------
@@ -98,7 +96,7 @@ def plot_data(R, L, C):
 
 fig = plt.figure()
 fig.suptitle(titre)
-fig.text(0.02, .9, justify(description), multialignment='left', verticalalignment='top')
+cached_text(fig, 0.02, .9, justify(description), multialignment='left', verticalalignment='top')
 
 ax1, ax2 = fig.subplots(2, 1, sharex=True, 
             gridspec_kw={'left':0.35, 'bottom':0.3, 'top':0.9, 'hspace':0.08})
@@ -129,7 +127,8 @@ loc = plticker.MultipleLocator(base=90) # this locator puts ticks at regular int
 ax2.yaxis.set_major_locator(loc)
 
 
-param_widgets = make_param_widgets(parameters, plot_data, slider_box=[0.35, 0.07, 0.4, 0.15])
+renderer = BlitRenderer(fig, lines)
+param_widgets = make_param_widgets(parameters, plot_data, slider_box=[0.35, 0.07, 0.4, 0.15], renderer=renderer)
 choose_widget = make_choose_plot(lines, box=[0.015, 0.25, 0.2, 0.15], which=[('R $\equiv$ I', 'R $\equiv$ I - phi'), ('L', 'L - phi'), ('C', 'C - phi')])
 reset_button = make_reset_button(param_widgets)
 log_button =  make_log_button(ax1, ylims={'log':(5E-2, 1E1), 'linear':ax1.get_ylim()})
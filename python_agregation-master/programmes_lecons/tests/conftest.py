@@ -0,0 +1,43 @@
+import os
+import sys
+
+import matplotlib
+matplotlib.use('Agg')
+
+import pytest
+from matplotlib.backend_bases import TimerBase
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+# Les programmes et le module programmes_lecons sont dans le répertoire parent
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class ManualTimer(TimerBase):
+    """ Timer déclenché par le test, comme par la boucle d'évènements d'une fenêtre"""
+    running = False
+
+    def _timer_start(self):
+        self.running = True
+
+    def _timer_stop(self):
+        self.running = False
+
+    def fire(self):
+        if self.running:
+            if self.single_shot:
+                self.running = False
+            self._on_timer()
+
+
+class ManualCanvas(FigureCanvasAgg):
+    def new_timer(self, *args, **kwargs):
+        return ManualTimer(*args, **kwargs)
+
+
+@pytest.fixture
+def interactive_figure():
+    """ Figure dont les timers ne se déclenchent que par timer.fire()"""
+    fig = Figure()
+    ManualCanvas(fig)
+    return fig
@@ -0,0 +1,38 @@
+import io
+
+from matplotlib.backend_bases import FigureCanvasBase
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from programmes_lecons.blit import BlitRenderer
+
+
+def _figure(canvas_class):
+    fig = Figure()
+    canvas_class(fig)
+    line, = fig.add_subplot().plot([0, 1], [0, 1])
+    return fig, line
+
+
+def test_artists_animated_with_blitting():
+    fig, line = _figure(FigureCanvasAgg)
+    BlitRenderer(fig, [line])
+    assert line.get_animated()
+
+
+def test_artists_drawn_without_blitting():
+    fig, line = _figure(FigureCanvasBase)
+    assert not fig.canvas.supports_blit
+    renderer = BlitRenderer(fig, [line])
+    assert not line.get_animated()
+    assert renderer.draw() is False
+
+
+def test_background_not_taken_from_savefig():
+    fig, line = _figure(FigureCanvasAgg)
+    renderer = BlitRenderer(fig, [line])
+    fig.canvas.draw()
+    assert renderer.draw() is True
+    fig.savefig(io.BytesIO(), format='png')
+    # Le fond contiendrait la ligne : la mise à jour suivante redessine tout
+    assert renderer.draw() is False
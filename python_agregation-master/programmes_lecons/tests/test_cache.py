@@ -0,0 +1,30 @@
+import operator
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+from programmes_lecons.cache import memoize, MemoizedFunction
+
+
+@memoize(maxsize=4)
+def carre(x):
+    return x*x
+
+
+def test_module_function_pickled_by_name():
+    carre(3)
+    assert pickle.loads(pickle.dumps(carre)) is carre
+
+
+def test_pickle_drops_lock_and_cache():
+    add = MemoizedFunction(operator.add, maxsize=4)
+    add(1, 2)
+    copy = pickle.loads(pickle.dumps(add))
+    assert copy is not add
+    assert copy.cache_info().currsize == 0
+    assert copy(1, 2) == 3
+    assert copy.cache_info().misses == 1
+
+
+def test_memoized_model_in_process_pool():
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        assert executor.submit(carre, 4).result() == 16
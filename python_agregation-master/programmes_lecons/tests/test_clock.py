@@ -0,0 +1,42 @@
+import numpy as np
+
+from programmes_lecons import widgets
+from programmes_lecons.clock import AnimationClock
+from programmes_lecons.widgets import FloatSlider, make_param_widgets
+
+
+def _clock(**kwd):
+    widgets.headless = True
+    try:
+        parameters = dict(t=FloatSlider(description='t', min=0, max=10, value=0))
+        param_widgets = make_param_widgets(parameters, lambda t: None, slider_box=[0.3, 0.05, 0.4, 0.05])
+    finally:
+        widgets.headless = False
+    return param_widgets, AnimationClock(param_widgets, 't', **kwd)
+
+
+def test_frame_times_linear_after_show():
+    param_widgets, clock = _clock(speed=1., fps=30)
+    times = []
+    for frame in range(10):
+        times.append(clock.time(frame))
+        param_widgets.show(t=times[-1])
+    np.testing.assert_allclose(times, np.arange(10)/30)
+
+
+def test_frame_times_wrap_on_period():
+    param_widgets, clock = _clock(speed=2., fps=10, period=1)
+    np.testing.assert_allclose([clock.time(k) for k in [0, 4, 5, 6]], [0, 0.8, 0, 0.2], atol=1E-12)
+
+
+def test_stopped_when_figure_closed():
+    import matplotlib.pyplot as plt
+    from matplotlib.backend_bases import CloseEvent
+    fig = plt.figure()
+    parameters = dict(t=FloatSlider(description='t', min=0, max=10, value=0))
+    param_widgets = make_param_widgets(parameters, lambda t: None, slider_box=[0.3, 0.05, 0.4, 0.05])
+    clock = AnimationClock(param_widgets, 't', start=True)
+    assert clock.running
+    CloseEvent('close_event', fig.canvas)._process()
+    assert not clock.running
+    plt.close(fig)
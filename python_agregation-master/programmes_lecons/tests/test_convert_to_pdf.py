@@ -0,0 +1,30 @@
+import re
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from utils.convert_to_pdf import merge, read_pdf
+
+
+def _pdf(filename, title):
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    fig.add_subplot().plot([0, 1], [0, 1])
+    fig.savefig(filename, metadata={'Title':title})
+    return filename
+
+
+def test_merged_bundle(tmp_path):
+    files = [_pdf(str(tmp_path / '{}.pdf'.format(n)), 'Page {} (voir 1 0 R)'.format(n)) for n in range(2)]
+    outfile = str(tmp_path / 'bundle.pdf')
+    merge(files, outfile)
+    objects, root = read_pdf(outfile)
+    pages = objects[int(re.search(rb'/Pages (\d+) 0 R', objects[root]).group(1))]
+    assert b'/Count 2' in pages
+    kids = [int(elm) for elm in re.findall(rb'(\d+) 0 R', re.search(rb'/Kids \[([^\]]*)\]', pages).group(1))]
+    for number in kids:
+        assert b'/Type /Page' in objects[number]
+    # Les chaînes de caractères ne sont pas renumérotées
+    with open(outfile, 'rb') as f:
+        data = f.read()
+    assert data.count(rb'\(voir 1 0 R\)') == 2
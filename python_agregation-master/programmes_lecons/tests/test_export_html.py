@@ -0,0 +1,28 @@
+import numpy as np
+
+from programmes_lecons.widgets import FloatSlider, IntSlider
+from utils.export_html import grid_axes, grid_points
+
+
+def _parameters():
+    return dict(N=IntSlider(value=2, min=2, max=30, description='N'),
+                a=FloatSlider(value=2, min=0.1, max=10., description='a'),
+                b=FloatSlider(value=1, min=0.1, max=2., description='b'))
+
+
+def _cells(parameters):
+    return lambda points: np.prod([len(values) for values in grid_axes(parameters, points).values()])
+
+
+def test_integer_slider_gets_full_range_first():
+    parameters = _parameters()
+    points = grid_points(parameters, _cells(parameters), max_size=29*10*10)
+    assert points == dict(N=29, a=10, b=10)
+
+
+def test_points_raised_up_to_the_cap():
+    parameters = _parameters()
+    size = _cells(parameters)
+    points = grid_points(parameters, size, max_size=200)
+    assert points['N'] == 29 and size(points) <= 200
+    assert all(size(dict(points, **{key:points[key]+1})) > 200 for key in ['a', 'b'])
@@ -0,0 +1,49 @@
+import gc
+import time
+import weakref
+
+import matplotlib.pyplot as plt
+
+from programmes_lecons.clock import AnimationClock
+from programmes_lecons.instrumentation import Instrumentation, get_instrumentation
+from programmes_lecons.widgets import FloatSlider, make_param_widgets
+
+
+def test_overlay_shows_dropped_frames():
+    fig = plt.figure()
+    parameters = dict(t=FloatSlider(description='t', min=0, max=1, value=0))
+    param_widgets = make_param_widgets(parameters, lambda t: None, slider_box=[0.3, 0.05, 0.4, 0.05],
+                                       instrument=False)
+    instrumentation = Instrumentation(fig)
+    anim = AnimationClock(param_widgets, 't', fixed_step=True)
+    instrumentation.watch_animation(anim)
+    anim.dropped = 3
+    instrumentation.update_overlay()
+    assert '3 images sautées' in instrumentation.overlay.get_text()
+    plt.close(fig)
+
+
+def _slow_model(t):
+    time.sleep(0.01)
+    return dict(y=t)
+
+
+def test_background_model_time_recorded():
+    fig = plt.figure()
+    parameters = dict(t=FloatSlider(description='t', min=0, max=1, value=0))
+    param_widgets = make_param_widgets(parameters, lambda y: None, slider_box=[0.3, 0.05, 0.4, 0.05],
+                                       model=_slow_model, background='thread', instrument=True)
+    param_widgets['t'].set_val(0.5)
+    record = get_instrumentation(fig).records[-1]
+    assert record['model'] >= 0.01
+    plt.close(fig)
+
+
+def test_figure_released():
+    fig = plt.figure()
+    get_instrumentation(fig, True)
+    ref = weakref.ref(fig)
+    plt.close(fig)
+    del fig
+    gc.collect()
+    assert ref() is None
@@ -0,0 +1,23 @@
+from matplotlib.lines import Line2D
+
+from programmes_lecons.lines import LineRegistry
+
+
+def test_hidden_line_computed_when_shown():
+    calls = []
+    def courbe(x, b):
+        calls.append(b)
+        return x, [b*elm for elm in x]
+    lines = LineRegistry(producers={'courbe':courbe})
+    lines['courbe'] = Line2D([], [], visible=False)
+    lines.update_data(x=[0, 1], b=2, unused=None)
+    assert calls == []
+    lines.set_visible('courbe', True)
+    assert calls == [2]
+    assert list(lines['courbe'].get_ydata()) == [0, 2]
+    # Déjà à jour : pas de nouveau calcul
+    lines.set_visible('courbe', False)
+    lines.set_visible('courbe', True)
+    assert calls == [2]
+    lines.update_data(x=[0, 1], b=3)
+    assert calls == [2, 3]
@@ -0,0 +1,22 @@
+import json
+
+import numpy as np
+
+from programmes_lecons import run
+
+
+def test_missing_parameters_take_initial_value(tmp_path):
+    param_file = tmp_path / 'jeux.json'
+    param_file.write_text(json.dumps([{'d':1}, {'E_max':6}]))
+    output = tmp_path / 'sets.npz'
+    run.main(['effet_tunnel', '--param-file', str(param_file), '-o', str(output)])
+    default = tmp_path / 'default.npz'
+    run.main(['effet_tunnel', '-o', str(default)])
+
+    with np.load(output) as sets, np.load(default) as ref:
+        np.testing.assert_array_equal(sets['params/d'], [1, 2])
+        np.testing.assert_array_equal(sets['params/E_max'], [6, 6])
+        keys = [key[2:] for key in ref.files if key.startswith('0/')]
+        assert keys
+        for key in keys:
+            np.testing.assert_array_equal(sets['1/' + key], ref['0/' + key])
@@ -0,0 +1,36 @@
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from programmes_lecons.scheduler import UpdateScheduler
+
+
+def test_burst_merged_into_one_update(interactive_figure):
+    calls = []
+    scheduler = UpdateScheduler(interactive_figure, calls.append)
+    assert not scheduler.immediate
+    for a in range(5):
+        scheduler.request(dict(a=a))
+    assert calls == []
+    scheduler._timer.fire()
+    assert calls == [dict(a=4)]
+    scheduler._timer.fire()
+    assert calls == [dict(a=4)]
+
+
+def test_cancel(interactive_figure):
+    calls = []
+    scheduler = UpdateScheduler(interactive_figure, calls.append)
+    scheduler.request(dict(a=1))
+    scheduler.cancel()
+    scheduler._timer.fire()
+    assert calls == []
+
+
+def test_immediate_without_event_loop():
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    calls = []
+    scheduler = UpdateScheduler(fig, calls.append)
+    scheduler.request(dict(a=1))
+    scheduler.request(dict(a=2))
+    assert calls == [dict(a=1), dict(a=2)]
@@ -0,0 +1,18 @@
+import pytest
+
+from programmes_lecons.tables import build_table
+from programmes_lecons.widgets import FloatSlider
+
+
+def test_single_point_axis_rejected():
+    parameters = dict(a=FloatSlider(description='a', min=0, max=1, value=0.5),
+                      b=FloatSlider(description='b', min=0, max=2, value=1))
+    with pytest.raises(ValueError):
+        build_table(lambda a, b: a*b, parameters, points={'a':5, 'b':1})
+
+
+def test_interpolation_error_reported():
+    parameters = dict(a=FloatSlider(description='a', min=0, max=1, value=0.5))
+    table = build_table(lambda a: a**2, parameters, points=3, n_check=10)
+    assert table.error['abs'] > 0
+    assert abs(table(a=0.5) - 0.25) < 1E-12
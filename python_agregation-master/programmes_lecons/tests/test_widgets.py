@@ -0,0 +1,35 @@
+import matplotlib.pyplot as plt
+
+from programmes_lecons.widgets import FloatSlider, make_param_widgets
+
+
+def _param_widgets(calls):
+    parameters = dict(a=FloatSlider(description='a', min=0, max=5, value=1),
+                      b=FloatSlider(description='b', min=0, max=5, value=2))
+    param_widgets = make_param_widgets(parameters, lambda a, b: calls.append((a, b)),
+                                       slider_box=[0.3, 0.05, 0.4, 0.1])
+    calls.clear()
+    return param_widgets
+
+
+def test_hold_single_update():
+    calls = []
+    fig = plt.figure()
+    param_widgets = _param_widgets(calls)
+    with param_widgets.hold():
+        param_widgets['a'].set_val(3)
+        param_widgets['b'].set_val(4)
+    assert calls == [(3, 4)]
+    plt.close(fig)
+
+
+def test_reset_single_update():
+    calls = []
+    fig = plt.figure()
+    param_widgets = _param_widgets(calls)
+    param_widgets.set_values(a=3, b=4)
+    assert calls == [(3, 4)]
+    calls.clear()
+    param_widgets.reset()
+    assert calls == [(1, 2)]
+    plt.close(fig)
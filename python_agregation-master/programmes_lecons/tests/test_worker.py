@@ -0,0 +1,30 @@
+import threading
+
+from programmes_lecons.worker import BackgroundWorker
+
+
+def _finish(worker):
+    """ Attend la fin du calcul en cours puis laisse le worker l'appliquer"""
+    worker._job[2].result(timeout=5)
+    worker._timer.fire()
+
+
+def test_superseded_result_dropped(interactive_figure):
+    release = threading.Event()
+    computed, applied = [], []
+    def model(a):
+        release.wait(5)
+        computed.append(a)
+        return a
+    worker = BackgroundWorker(interactive_figure, model, lambda values, result: applied.append(result))
+    for a in [1, 2, 3]:
+        worker.submit(dict(a=a))
+    release.set()
+    _finish(worker)
+    # Le résultat pour a=1 est périmé : le calcul est relancé avec a=3
+    assert applied == [] and worker.dropped == 1 and worker.busy
+    _finish(worker)
+    assert applied == [3]
+    assert computed == [1, 3]
+    assert not worker.busy
+    worker.shutdown()
@@ -0,0 +1,68 @@
+""" Mesure du temps d'import du module programmes_lecons
+
+Chaque import est fait dans un nouvel interpréteur (le meilleur temps sur
+plusieurs essais est retenu), sans compter le démarrage de l'interpréteur. Le programme
+s'arrête avec une erreur si l'import "léger" (justify, constantes) dépasse le
+budget ou importe matplotlib.
+
+    python -m utils.bench_import
+    python -m utils.bench_import --budget 30 --repeat 10
+"""
+
+import argparse
+import subprocess
+import sys
+
+# Nom -> code exécuté dans un nouvel interpréteur
+benchmarks = {
+    'light':'import programmes_lecons; from programmes_lecons import justify; '
+             'from programmes_lecons.constantes import c, h, k',
+    'widgets':'from programmes_lecons import make_param_widgets, FloatSlider',
+}
+
+check_code = """
+import sys
+{code}
+print(int('matplotlib' in sys.modules))
+"""
+
+timing_code = """
+import time
+t = time.perf_counter()
+{code}
+print(time.perf_counter() - t)
+"""
+
+
+def run(code):
+    out = subprocess.check_output([sys.executable, '-c', code], universal_newlines=True)
+    return out.split()[-1]
+
+
+def best_time(code, repeat=5):
+    """ Meilleur temps d'exécution de code dans un nouvel interpréteur (s)"""
+    return min(float(run(timing_code.format(code=code))) for _ in range(repeat))
+
+
+def main(budget=50., repeat=5):
+    """ Affiche les temps d'import et vérifie le budget (en ms)"""
+    times = {name:best_time(code, repeat) for name, code in benchmarks.items()}
+    for name, t in times.items():
+        print('{:10s} {:8.1f} ms'.format(name, t*1E3))
+
+    errors = []
+    if times['light']*1E3 > budget:
+        errors.append("L'import léger prend {:.1f} ms (budget : {:.1f} ms)".format(times['light']*1E3, budget))
+    if run(check_code.format(code=benchmarks['light'])) != '0':
+        errors.append("L'import léger importe matplotlib")
+    for msg in errors:
+        print(msg)
+    return 1 if errors else 0
+
+
+if __name__=='__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--budget', type=float, default=50., help="budget de l'import léger (ms)")
+    parser.add_argument('--repeat', type=int, default=5, help="nombre d'essais")
+    args = parser.parse_args()
+    sys.exit(main(args.budget, args.repeat))
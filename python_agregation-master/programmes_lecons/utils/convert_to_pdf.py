@@ -1,22 +1,254 @@
-import subprocess
+""" Création des pdf de tous les programmes
+
+Les programmes sont exportés en parallèle (un processus par programme, backend
+Agg). Un programme n'est exporté de nouveau que si son fichier, ses fichiers de
+données, le module programmes_lecons ou l'option --max-vertices ont changé
+depuis le dernier export (empreintes enregistrées dans _pdf/manifest.json).
+
+Les chemins sont simplifiés et les artistes très denses sont dessinés en image
+(voir programmes_lecons.export) ; la taille de chaque page est affichée.
+
+Les pdf sont ensuite réunis dans doc/programmes_lecons.pdf (en Python, sans
+outil externe ; seuls les pdf écrits par matplotlib, avec une table xref non
+compressée, sont pris en charge).
+
+    python -m utils.convert_to_pdf
+    python -m utils.convert_to_pdf --force -j 4
+"""
+
+import argparse
+import glob
+import hashlib
+import importlib
+import io
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from programmes_lecons.export import save_figure, format_size
 
 from .index import tous_les_programmes
 
-for programme_name in tous_les_programmes:
-    print(programme_name, end='')
-    _temp = __import__(programme_name, globals(), locals(), ['fig'], 0)
-    _temp.fig.savefig('_pdf/{}.pdf'.format(programme_name))
-    print(': OK')
-#    print('* {}'.format(_temp.titre))
+pdf_dir = '_pdf'
+bundle = 'doc/programmes_lecons.pdf'
+manifest_file = os.path.join(pdf_dir, 'manifest.json')
+
+
+def pdf_name(programme_name):
+    return os.path.join(pdf_dir, '{}.pdf'.format(programme_name))
+
+
+def file_hash(filename):
+    with open(filename, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def dependencies(programme_name):
+    """ Fichiers dont dépend le pdf d'un programme"""
+    files = [programme_name + '.py']
+    # Fichiers de données (van_der_waals_precalc_data.json, ...)
+    files += [elm for elm in sorted(glob.glob(programme_name + '_*')) if os.path.isfile(elm)]
+    files += sorted(glob.glob(os.path.join('programmes_lecons', '*.py')))
+    files += sorted(glob.glob(os.path.join('programmes_lecons', '*.mplstyle')))
+    return files
+
+
+def fingerprint(programme_name, max_vertices=2000):
+    """ Empreinte des fichiers et des options dont dépend le pdf d'un programme"""
+    return {'files':{filename:file_hash(filename) for filename in dependencies(programme_name)},
+            'max_vertices':max_vertices}
+
+
+def load_manifest():
+    try:
+        with open(manifest_file) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest):
+    with open(manifest_file, 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+
+
+def _init_worker():
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def export(programme_name, max_vertices=2000):
+    """ Exporte la figure d'un programme (exécuté dans un processus séparé)
+
+    Renvoie la durée de l'export et la taille du fichier.
+    """
+    t = time.perf_counter()
+    module = importlib.import_module(programme_name)
+    size = save_figure(module.fig, pdf_name(programme_name), max_vertices=max_vertices)
+    return time.perf_counter() - t, size
+
+
+_reference = re.compile(rb'\b(\d+) 0 R\b')
+# Chaînes (littérales ou hexadécimales), références et début du stream d'un objet
+_token = re.compile(rb'\((?:\\.|[^\\()])*\)|<[0-9A-Fa-f\s]*>|\b(\d+) 0 R\b|\bstream\r?\n', re.DOTALL)
+
+
+def _search(pattern, data, filename):
+    match = re.search(pattern, data)
+    if match is None:
+        raise ValueError('{} : format non supporté'.format(filename))
+    return match
+
+
+def read_pdf(filename):
+    """ Objets d'un pdf écrit par matplotlib (table xref non compressée)
+
+    Renvoie un dictionnaire numéro -> contenu de l'objet et le numéro du
+    catalogue.
+    """
+    with open(filename, 'rb') as f:
+        data = f.read()
+    match = re.search(rb'startxref\s+(\d+)\s+%%EOF\s*$', data)
+    start = int(match.group(1)) if match else -1
+    if not data.startswith(b'xref', start):
+        raise ValueError('{} : format non supporté (table xref compressée)'.format(filename))
+    table, trailer = data[start+4:].split(b'trailer', 1)
+    tokens = table.split()
+    offsets = {}
+    i = 0
+    while i < len(tokens):
+        first, count = int(tokens[i]), int(tokens[i+1])
+        i += 2
+        for number in range(first, first+count):
+            if tokens[i+2] == b'n':
+                offsets[number] = int(tokens[i])
+            i += 3
+    ends = sorted(offsets.values()) + [start]
+    objects = {}
+    for number, offset in offsets.items():
+        chunk = data[offset:ends[ends.index(offset)+1]]
+        header = re.match(rb'\s*%d 0 obj' % number, chunk)
+        if header is None:
+            raise ValueError('{} : objet {} non trouvé'.format(filename, number))
+        objects[number] = chunk[header.end():chunk.rindex(b'endobj')]
+    root = int(_search(rb'/Root (\d+) 0 R', trailer, filename).group(1))
+    return objects, root
+
+
+def _renumber(body, mapping):
+    """ Change les références (N 0 R) d'un objet
+
+    Le stream et les chaînes de caractères (/Title (...), ...) ne sont pas
+    modifiés.
+    """
+    result = []
+    position = 0
+    for match in _token.finditer(body):
+        if match.group(0).startswith(b'stream'):
+            break
+        if match.group(1) is not None:
+            result += [body[position:match.start()], b'%d 0 R' % mapping(int(match.group(1)))]
+            position = match.end()
+    return b''.join(result) + body[position:]
+
+
+def merge(file_list, outfile=bundle):
+    """ Réunit les pdf (écrits par matplotlib) dans un seul fichier
+
+    Les objets de chaque fichier sont renumérotés et toutes les pages sont
+    rattachées à un même arbre de pages.
+    """
+    pages_number, catalog_number = 1, 2
+    objects = {}
+    kids = []
+    next_number = 3
+    for filename in file_list:
+        pdf_objects, root = read_pdf(filename)
+        old_pages = int(_search(rb'/Pages (\d+) 0 R', pdf_objects[root], filename).group(1))
+        shift = next_number
+        mapping = lambda number: pages_number if number == old_pages else number + shift
+        kids_text = _search(rb'/Kids \[([^\]]*)\]', pdf_objects[old_pages], filename).group(1)
+        kids += [mapping(int(elm)) for elm in _reference.findall(kids_text)]
+        for number, body in pdf_objects.items():
+            if number not in (root, old_pages):
+                objects[mapping(number)] = _renumber(body, mapping)
+        next_number = max(pdf_objects) + shift + 1
+    objects[pages_number] = b'\n<< /Type /Pages /Kids [ %s ] /Count %d >>\n' % (
+        b' '.join(b'%d 0 R' % elm for elm in kids), len(kids))
+    objects[catalog_number] = b'\n<< /Type /Catalog /Pages %d 0 R >>\n' % pages_number
+
+    output = io.BytesIO()
+    output.write(b'%PDF-1.4\n%\xac\xdc \xab\xba\n')
+    offsets = {}
+    for number in sorted(objects):
+        offsets[number] = output.tell()
+        output.write(b'%d 0 obj' % number + objects[number] + b'endobj\n')
+    xref = output.tell()
+    size = max(objects) + 1
+    output.write(b'xref\n0 %d\n' % size)
+    output.write(b'0000000000 65535 f \n')
+    for number in range(1, size):
+        if number in offsets:
+            output.write(b'%010d 00000 n \n' % offsets[number])
+        else:
+            output.write(b'0000000000 00000 f \n')
+    output.write(b'trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (size, catalog_number, xref))
+    with open(outfile, 'wb') as f:
+        f.write(output.getvalue())
+
+
+def main(force=False, jobs=None, max_vertices=2000):
+    os.makedirs(pdf_dir, exist_ok=True)
+    manifest = load_manifest()
+    todo = []
+    for programme_name in tous_les_programmes:
+        fingerprints = fingerprint(programme_name, max_vertices)
+        if not force and manifest.get(programme_name) == fingerprints and os.path.exists(pdf_name(programme_name)):
+            print('{}: unchanged'.format(programme_name))
+        else:
+            todo.append((programme_name, fingerprints))
+
+    failed = []
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as executor:
+        futures = [(name, fingerprints, executor.submit(export, name, max_vertices)) for name, fingerprints in todo]
+        for programme_name, fingerprints, future in futures:
+            try:
+                duration, size = future.result()
+            except Exception as e:
+                print('{}: FAILED ({!r})'.format(programme_name, e))
+                manifest.pop(programme_name, None)
+                failed.append(programme_name)
+                continue
+            print('{}: OK ({:.1f} s, {})'.format(programme_name, duration, format_size(size)))
+            manifest[programme_name] = fingerprints
+    save_manifest(manifest)
+
+    file_list = [pdf_name(programme_name) for programme_name in tous_les_programmes
+                 if os.path.exists(pdf_name(programme_name))]
+    merged = False
+    if file_list:
+        try:
+            merge(file_list)
+            merged = True
+        except ValueError as e:
+            print('{} non créé : {}'.format(bundle, e))
 
-file_list = ['_pdf/{}.pdf'.format(programme_name) for programme_name in tous_les_programmes]
+    print()
+    print('Taille des pages :')
+    for filename in sorted(file_list, key=os.path.getsize, reverse=True):
+        print('    {:40s} {:>8s}'.format(os.path.basename(filename), format_size(os.path.getsize(filename))))
+    if merged:
+        print('    {:40s} {:>8s}'.format(bundle, format_size(os.path.getsize(bundle))))
+    return failed
 
-try:
-    subprocess.call(['pdfjoin', '--outfile', 'doc/programmes_lecons.pdf']+file_list)
-except Exception as e:
-    msg = 'Not able to merge pdf files in the single file. Individual files are in the _pdf folder'
-    print('#'*len(msg))
-    print(msg)
-    print('#'*len(msg))
-    raise
 
+if __name__=='__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--force', action='store_true', help='exporte tous les programmes')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='nombre de processus')
+    parser.add_argument('--max-vertices', type=int, default=2000,
+                        help="nombre de sommets au delà duquel un artiste est dessiné en image")
+    args = parser.parse_args()
+    main(force=args.force, jobs=args.jobs, max_vertices=args.max_vertices)
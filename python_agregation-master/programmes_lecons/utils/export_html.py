@@ -0,0 +1,451 @@
+""" Export d'un programme en page HTML autonome
+
+Les courbes du programme sont précalculées (sans interface, voir
+programmes_lecons.run) sur une grille couvrant les sliders. La page HTML
+contient ces données et un peu de JavaScript qui interpole entre les
+points de la grille lorsqu'on déplace un slider : il suffit d'un
+navigateur, sans Python.
+
+Chaque slider a son propre nombre de points, choisi pour que la page ne
+dépasse pas une taille maximale : les sliders entiers (IntSlider) ont toutes
+leurs valeurs si possible, puis les nombres de points sont augmentés tant que
+la page reste sous la limite. Les sliders entiers prennent la valeur de la
+grille la plus proche, les autres sont interpolés linéairement (x et y quand
+x dépend des paramètres). Les limites des axes sont celles de la figure pour
+les valeurs initiales des sliders.
+
+    python -m utils.export_html effet_tunnel
+    python -m utils.export_html --all --max-size 2
+"""
+
+import argparse
+import base64
+import html
+import itertools
+import json
+import os
+
+import numpy as np
+
+from programmes_lecons.export import format_size
+from programmes_lecons.run import load_program, evaluate
+from programmes_lecons.widgets import IntSlider
+
+from .index import tous_les_programmes
+from .registry import registry
+
+html_dir = '_html'
+
+
+def _encode(array):
+    """ Tableau -> chaîne base64 de float32"""
+    return base64.b64encode(np.asarray(array, dtype='<f4').tobytes()).decode('ascii')
+
+
+def grid_axes(parameters, points):
+    """ Valeurs de la grille pour chaque slider (au plus points[key] valeurs)"""
+    axes = {}
+    for key, widget in parameters.items():
+        if isinstance(widget, IntSlider):
+            values = np.arange(widget.min, widget.max+1)
+            if len(values) > points[key]:
+                values = np.unique(np.round(np.linspace(widget.min, widget.max, points[key])).astype(int))
+            axes[key] = values
+        else:
+            axes[key] = np.linspace(widget.min, widget.max, points[key])
+    return axes
+
+
+def _style(line):
+    from matplotlib.colors import to_hex
+    return {'color':to_hex(line.get_color()), 'lw':line.get_linewidth(),
+            'ls':line.get_linestyle(), 'marker':str(line.get_marker()),
+            'ms':line.get_markersize(), 'alpha':line.get_alpha() or 1,
+            'visible':bool(line.get_visible())}
+
+
+def figure_layout(namespace):
+    """ Position et limites des axes, style des lignes"""
+    fig = namespace['fig']
+    lines = {key:line for key, line in namespace.get('lines', {}).items() if hasattr(line, 'get_xydata')}
+    axes = [ax for ax in fig.axes if any(line.axes is ax for line in lines.values())]
+    layout = {'size':list(fig.get_size_inches()), 'axes':[], 'lines':{}}
+    for ax in axes:
+        layout['axes'].append({'position':list(ax.get_position().bounds),
+                               'xlim':list(ax.get_xlim()), 'ylim':list(ax.get_ylim()),
+                               'xscale':ax.get_xscale(), 'yscale':ax.get_yscale(),
+                               'xlabel':ax.get_xlabel(), 'ylabel':ax.get_ylabel(),
+                               'title':ax.get_title()})
+    for key, line in lines.items():
+        layout['lines'][key] = dict(_style(line), axes=axes.index(line.axes))
+    return layout
+
+
+def sample(namespace, axes):
+    """ Calcule les lignes pour tous les points de la grille
+
+    Renvoie, pour chaque ligne, un dictionnaire avec x (si x ne dépend pas
+    des paramètres) et la liste des données sur la grille.
+    """
+    keys = list(axes)
+    grid = list(itertools.product(*[range(len(axes[key])) for key in keys]))
+    results = {}
+    empty = (np.zeros(0), np.zeros(0))
+    for n, index in enumerate(grid):
+        values = {key:axes[key][i].item() for key, i in zip(keys, index)}
+        for name, (x, y) in evaluate(namespace, **values).items():
+            # Une ligne peut n'exister que pour une partie de la grille
+            # (nombre d'états propres variable, ...) : elle est vide ailleurs
+            results.setdefault(name, [empty]*len(grid))[n] = (x, y)
+    data = {}
+    for name, curves in results.items():
+        x0 = curves[0][0]
+        same_x = all(len(x) == len(x0) and np.array_equal(x, x0, equal_nan=True) for x, y in curves)
+        if same_x:
+            data[name] = {'x':_encode(x0), 'y':[_encode(y) for x, y in curves]}
+        else:
+            data[name] = {'xy':[_encode(np.column_stack([x, y]).ravel()) for x, y in curves]}
+    return data
+
+
+def _data_size(data):
+    return len(json.dumps(data))
+
+
+def size_model(namespace, parameters):
+    """ Taille des données en fonction du nombre de points de la grille
+
+    Calculée sur la grille à deux points par slider : x, quand il ne dépend
+    pas des paramètres, n'est enregistré qu'une fois, le reste est
+    proportionnel au nombre de points de la grille.
+    Renvoie une fonction points -> taille estimée.
+    """
+    def cells(points):
+        return np.prod([len(values) for values in grid_axes(parameters, points).values()])
+    points = {key:2 for key in parameters}
+    data = sample(namespace, grid_axes(parameters, points))
+    fixed = sum(len(elm['x']) for elm in data.values() if 'x' in elm)
+    per_point = (_data_size(data) - fixed)/cells(points)
+    return lambda points: fixed + per_point*cells(points)
+
+
+def grid_points(parameters, size, max_size, max_points=21):
+    """ Nombre de points par slider pour que size(points) ne dépasse pas max_size
+
+    Les sliders entiers ont d'abord toutes leurs valeurs (si la taille le
+    permet), puis on ajoute un point au slider qui en a le moins (ou au
+    suivant si la taille dépasse la limite), jusqu'à ce qu'aucun ne puisse
+    en recevoir.
+    """
+    def full(key):
+        widget = parameters[key]
+        if isinstance(widget, IntSlider):
+            return int(widget.max - widget.min + 1)
+        return max_points
+    points = {key:min(2, full(key)) for key in parameters}
+    for key, widget in parameters.items():
+        if isinstance(widget, IntSlider) and size(dict(points, **{key:full(key)})) <= max_size:
+            points[key] = full(key)
+    while True:
+        candidates = sorted((key for key in parameters if points[key] < full(key)), key=lambda key:points[key])
+        for key in candidates:
+            if size(dict(points, **{key:points[key]+1})) <= max_size:
+                points[key] += 1
+                break
+        else:
+            return points
+
+
+def export_program(name, filename=None, max_size=5., max_points=21):
+    """ Crée la page HTML d'un programme (max_size en Mo)
+
+    Renvoie (fichier, taille, nombre de points de chaque slider).
+    """
+    namespace = load_program(name, all_lines=False)
+    lines = namespace.get('lines', {})
+    # Les courbes cachées sont aussi calculées pour pouvoir les afficher
+    visible = {key:line.get_visible() for key, line in lines.items() if hasattr(line, 'get_visible')}
+    if hasattr(lines, 'producers'):
+        for key in lines.producers:
+            lines[key].set_visible(True)
+
+    parameters = namespace.get('parameters', {}) if namespace.get('param_widgets') is not None else {}
+    info = {programme['name']:programme for programme in registry()}.get(name, {})
+    defaults = {key:widget.value for key, widget in parameters.items()}
+
+    size = size_model(namespace, parameters)
+    points = grid_points(parameters, size, max_size*1E6, max_points)
+    while True:
+        axes = grid_axes(parameters, points)
+        data = sample(namespace, axes)
+        # L'estimation peut être un peu juste (courbes de longueur variable)
+        larger = [key for key in parameters if len(axes[key]) > 2]
+        if _data_size(data) <= max_size*1E6 or not larger:
+            break
+        key = max(larger, key=lambda key:len(axes[key]))
+        points[key] = len(axes[key]) - 1
+
+    # Mise en page pour les valeurs initiales, une fois toutes les lignes
+    # créées (certains programmes en ajoutent selon les paramètres)
+    evaluate(namespace, **defaults)
+    layout = figure_layout(namespace)
+    for key, state in visible.items():
+        if key in layout['lines']:
+            layout['lines'][key]['visible'] = bool(state)
+
+    sliders = [{'key':key, 'description':widget.description, 'min':widget.min, 'max':widget.max,
+                'value':widget.value, 'integer':isinstance(widget, IntSlider),
+                'grid':axes[key].tolist()} for key, widget in parameters.items()]
+    content = {'titre':info.get('titre', name), 'layout':layout, 'sliders':sliders, 'data':data}
+    page = template.replace('{{titre}}', html.escape(content['titre']))
+    page = page.replace('{{description}}', html.escape(info.get('description') or ''))
+    page = page.replace('{{content}}', json.dumps(content))
+
+    filename = filename or os.path.join(html_dir, name + '.html')
+    os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write(page)
+    return filename, os.path.getsize(filename), {key:len(values) for key, values in axes.items()}
+
+
+template = r"""<!DOCTYPE html>
+<html lang="fr">
+<head>
+<meta charset="utf-8">
+<title>{{titre}}</title>
+<style>
+body {font-family: sans-serif; margin: 1em;}
+#description {white-space: pre-wrap; font-size: 0.9em; max-width: 60em;}
+.slider {margin: 0.3em 0;}
+.slider label {display: inline-block; width: 22em;}
+.slider input[type=range] {width: 25em; vertical-align: middle;}
+canvas {border: 1px solid #ddd;}
+</style>
+</head>
+<body>
+<h1>{{titre}}</h1>
+<div id="description">{{description}}</div>
+<canvas id="figure"></canvas>
+<div id="lines"></div>
+<div id="sliders"></div>
+<script>
+"use strict";
+const content = {{content}};
+
+function decode(text) {
+    const bytes = Uint8Array.from(atob(text), c => c.charCodeAt(0));
+    return new Float32Array(bytes.buffer);
+}
+
+// Décodage des données
+const data = {};
+for (const [key, elm] of Object.entries(content.data)) {
+    data[key] = {x: elm.x ? decode(elm.x) : null,
+                 y: elm.y ? elm.y.map(decode) : null,
+                 xy: elm.xy ? elm.xy.map(decode) : null};
+}
+const sliders = content.sliders;
+const values = {};
+const visible = {};
+
+// Indice dans la grille (aplatie) d'une liste d'indices par slider
+function flatIndex(indices) {
+    let index = 0;
+    for (let i = 0; i < sliders.length; i++) {
+        index = index*sliders[i].grid.length + indices[i];
+    }
+    return index;
+}
+
+// Coins de la grille et poids pour les valeurs des sliders
+function corners() {
+    let result = [{indices: [], weight: 1}];
+    for (const slider of sliders) {
+        const grid = slider.grid, v = values[slider.key];
+        let i = 0;
+        while (i < grid.length - 2 && v > grid[i+1]) i++;
+        let t = grid.length > 1 ? (v - grid[i])/(grid[i+1] - grid[i]) : 0;
+        t = Math.min(Math.max(t, 0), 1);
+        let choices;
+        if (grid.length == 1) choices = [[0, 1]];
+        else if (slider.integer) choices = [[t < 0.5 ? i : i+1, 1]];
+        else choices = [[i, 1-t], [i+1, t]];
+        const next = [];
+        for (const c of result) {
+            for (const [j, w] of choices) {
+                if (w > 0) next.push({indices: c.indices.concat([j]), weight: c.weight*w});
+            }
+        }
+        result = next;
+    }
+    return result;
+}
+
+// Données (x, y) d'une ligne pour les valeurs courantes des sliders
+function lineData(key) {
+    const elm = data[key];
+    const cs = corners();
+    if (elm.x) {
+        const y = new Float32Array(elm.x.length);
+        for (const c of cs) {
+            const yc = elm.y[flatIndex(c.indices)];
+            for (let k = 0; k < y.length; k++) y[k] += c.weight*yc[k];
+        }
+        return [elm.x, y];
+    }
+    // x dépend des paramètres : x et y sont interpolés point par point si
+    // les courbes des coins ont la même longueur, sinon on prend le point de
+    // la grille le plus proche
+    const xys = cs.map(c => elm.xy[flatIndex(c.indices)]);
+    let weights = cs.map(c => c.weight);
+    if (!xys.every(xy => xy.length == xys[0].length)) {
+        let best = 0;
+        for (let i = 0; i < cs.length; i++) if (cs[i].weight > cs[best].weight) best = i;
+        weights = cs.map((c, i) => i == best ? 1 : 0);
+    }
+    const n = Math.max(...xys.map((xy, i) => weights[i] > 0 ? xy.length : 0))/2;
+    const x = new Float32Array(n), y = new Float32Array(n);
+    xys.forEach((xy, i) => {
+        if (weights[i] == 0) return;
+        for (let k = 0; k < n; k++) {x[k] += weights[i]*xy[2*k]; y[k] += weights[i]*xy[2*k+1];}
+    });
+    return [x, y];
+}
+
+function niceTicks(a, b) {
+    const lo = Math.min(a, b), hi = Math.max(a, b);
+    const raw = (hi - lo)/6;
+    const p = Math.pow(10, Math.floor(Math.log10(raw)));
+    const step = [1, 2, 2.5, 5, 10].map(m => m*p).find(s => s >= raw);
+    const ticks = [];
+    for (let t = Math.ceil(lo/step)*step; t <= hi + step*1e-9; t += step) ticks.push(t);
+    return ticks;
+}
+
+function cleanLabel(text) {
+    return text.replace(/\$/g, '').replace(/\\mathrm\{([^}]*)\}/g, '$1').replace(/\\/g, '');
+}
+
+const canvas = document.getElementById('figure');
+const ctx = canvas.getContext('2d');
+const layout = content.layout;
+const width = 1000, height = Math.round(1000*layout.size[1]/layout.size[0]);
+canvas.width = width; canvas.height = height;
+
+function draw() {
+    ctx.clearRect(0, 0, width, height);
+    ctx.font = '13px sans-serif';
+    layout.axes.forEach((ax, n) => {
+        const [x0, y0, w, h] = ax.position;
+        const left = x0*width, top = (1 - y0 - h)*height, W = w*width, H = h*height;
+        const tx = v => ax.xscale == 'log' ? Math.log10(v) : v;
+        const ty = v => ax.yscale == 'log' ? Math.log10(v) : v;
+        const [xa, xb] = ax.xlim.map(tx), [ya, yb] = ax.ylim.map(ty);
+        const px = v => left + (tx(v) - xa)/(xb - xa)*W;
+        const py = v => top + H - (ty(v) - ya)/(yb - ya)*H;
+        ctx.strokeStyle = 'black'; ctx.lineWidth = 1; ctx.setLineDash([]);
+        ctx.strokeRect(left, top, W, H);
+        ctx.fillStyle = 'black';
+        ctx.textAlign = 'center'; ctx.textBaseline = 'top';
+        for (const t of niceTicks(xa, xb)) {
+            const X = left + (t - xa)/(xb - xa)*W;
+            ctx.beginPath(); ctx.moveTo(X, top + H); ctx.lineTo(X, top + H - 5); ctx.stroke();
+            ctx.fillText(ax.xscale == 'log' ? '1e' + t : +t.toPrecision(6), X, top + H + 3);
+        }
+        ctx.textAlign = 'right'; ctx.textBaseline = 'middle';
+        for (const t of niceTicks(ya, yb)) {
+            const Y = top + H - (t - ya)/(yb - ya)*H;
+            ctx.beginPath(); ctx.moveTo(left, Y); ctx.lineTo(left + 5, Y); ctx.stroke();
+            ctx.fillText(ax.yscale == 'log' ? '1e' + t : +t.toPrecision(6), left - 4, Y);
+        }
+        ctx.textAlign = 'center'; ctx.textBaseline = 'top';
+        ctx.fillText(cleanLabel(ax.xlabel), left + W/2, top + H + 20);
+        ctx.fillText(cleanLabel(ax.title), left + W/2, top - 20);
+        ctx.save(); ctx.translate(left - 55, top + H/2); ctx.rotate(-Math.PI/2);
+        ctx.fillText(cleanLabel(ax.ylabel), 0, 0); ctx.restore();
+
+        ctx.save();
+        ctx.beginPath(); ctx.rect(left, top, W, H); ctx.clip();
+        for (const [key, style] of Object.entries(layout.lines)) {
+            if (style.axes != n || !visible[key]) continue;
+            const [x, y] = lineData(key);
+            ctx.globalAlpha = style.alpha;
+            ctx.strokeStyle = style.color; ctx.fillStyle = style.color;
+            ctx.lineWidth = style.lw*1.3;
+            ctx.setLineDash(style.ls == '--' ? [6, 4] : style.ls == ':' ? [2, 3] : style.ls == '-.' ? [6, 3, 2, 3] : []);
+            if (!['None', ' ', ''].includes(style.ls)) {
+                ctx.beginPath();
+                let pen = false;
+                for (let k = 0; k < x.length; k++) {
+                    if (!isFinite(x[k]) || !isFinite(y[k])) {pen = false; continue;}
+                    if (pen) ctx.lineTo(px(x[k]), py(y[k])); else ctx.moveTo(px(x[k]), py(y[k]));
+                    pen = true;
+                }
+                ctx.stroke();
+            }
+            if (!['None', ' ', '', 'none'].includes(style.marker)) {
+                const r = Math.max(style.ms/2, 1);
+                for (let k = 0; k < x.length; k++) {
+                    if (!isFinite(x[k]) || !isFinite(y[k])) continue;
+                    ctx.beginPath(); ctx.arc(px(x[k]), py(y[k]), r, 0, 2*Math.PI); ctx.fill();
+                }
+            }
+        }
+        ctx.restore();
+        ctx.globalAlpha = 1;
+    });
+}
+
+// Cases à cocher des lignes et sliders
+const linesDiv = document.getElementById('lines');
+for (const [key, style] of Object.entries(layout.lines)) {
+    visible[key] = style.visible;
+    if (Object.keys(layout.lines).length < 2) continue;
+    const label = document.createElement('label');
+    const box = document.createElement('input');
+    box.type = 'checkbox'; box.checked = style.visible;
+    box.addEventListener('change', () => {visible[key] = box.checked; draw();});
+    label.appendChild(box); label.appendChild(document.createTextNode(' ' + key + ' '));
+    label.style.color = style.color;
+    linesDiv.appendChild(label);
+}
+const slidersDiv = document.getElementById('sliders');
+for (const slider of sliders) {
+    values[slider.key] = slider.value;
+    const div = document.createElement('div'); div.className = 'slider';
+    const label = document.createElement('label'); label.textContent = cleanLabel(slider.description);
+    const input = document.createElement('input');
+    input.type = 'range'; input.min = slider.min; input.max = slider.max;
+    input.step = slider.integer ? 1 : (slider.max - slider.min)/1000;
+    input.value = slider.value;
+    const output = document.createElement('span'); output.textContent = ' ' + (+slider.value).toPrecision(4);
+    input.addEventListener('input', () => {
+        values[slider.key] = +input.value;
+        output.textContent = ' ' + (+input.value).toPrecision(4);
+        requestAnimationFrame(draw);
+    });
+    div.appendChild(label); div.appendChild(input); div.appendChild(output);
+    slidersDiv.appendChild(div);
+}
+draw();
+</script>
+</body>
+</html>
+"""
+
+
+if __name__=='__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('names', nargs='*', help='programmes exportés')
+    parser.add_argument('--all', action='store_true', help='exporte tous les programmes')
+    parser.add_argument('--max-size', type=float, default=5., help='taille maximale d\'une page (Mo)')
+    parser.add_argument('--max-points', type=int, default=21, help='nombre maximal de points par slider (non entier)')
+    args = parser.parse_args()
+    for name in (tous_les_programmes if args.all else args.names):
+        try:
+            filename, size, points = export_program(name, max_size=args.max_size, max_points=args.max_points)
+        except Exception as e:
+            print('{}: FAILED ({!r})'.format(name, e))
+            continue
+        grid = ', '.join('{}: {}'.format(key, count) for key, count in points.items())
+        print('{}: {} ({}, points de la grille : {})'.format(name, filename, format_size(size), grid or '-'))
@@ -0,0 +1,179 @@
+""" Export des animations en vidéo (mp4, webm, gif)
+
+Les images sont calculées en parallèle : l'axe du temps est découpé en
+morceaux d'images consécutives, chaque processus (backend Agg) exécute le
+programme une fois puis calcule les images des morceaux qu'on lui donne.
+Les images sont envoyées dans l'ordre, sans fichier temporaire, sur
+l'entrée standard de ffmpeg. Sans ffmpeg, seul le gif est possible (avec
+Pillow).
+
+Le temps simulé est celui de l'AnimationClock du programme (mêmes vitesse,
+période et nombre d'images par seconde que l'animation à l'écran). Par
+défaut, la vidéo dure une période de l'animation.
+
+    python -m utils.export_video propagation_onde
+    python -m utils.export_video propagation_son -o son.gif --duration 5 -j 4
+"""
+
+import argparse
+import importlib
+import os
+import shutil
+import subprocess
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from programmes_lecons.export import format_size
+
+video_dir = '_video'
+
+# Options de ffmpeg selon le format de sortie
+codecs = {
+    'mp4':['-c:v', 'libx264', '-pix_fmt', 'yuv420p', '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2'],
+    'webm':['-c:v', 'libvpx-vp9', '-b:v', '0', '-crf', '32', '-pix_fmt', 'yuv420p'],
+    'gif':['-vf', 'split[a][b];[a]palettegen[p];[b][p]paletteuse'],
+}
+
+_programmes = {}
+
+
+def _init_worker(dpi):
+    import matplotlib
+    matplotlib.use('Agg')
+    matplotlib.rcParams['figure.dpi'] = dpi
+
+
+def find_clock(module):
+    """ L'AnimationClock d'un programme"""
+    from programmes_lecons.clock import AnimationClock
+    for value in vars(module).values():
+        if isinstance(value, AnimationClock):
+            return value
+    raise ValueError("Le programme {} n'a pas d'animation (AnimationClock)".format(module.__name__))
+
+
+def load(programme_name):
+    """ Importe le programme (une seule fois par processus) et arrête son animation"""
+    if programme_name not in _programmes:
+        module = importlib.import_module(programme_name)
+        clock = find_clock(module)
+        clock.stop()
+        _programmes[programme_name] = module, clock
+    return _programmes[programme_name]
+
+
+def info(programme_name):
+    """ Nombre d'images par seconde, période (en images) et taille des images"""
+    module, clock = load(programme_name)
+    width, height = module.fig.canvas.get_width_height()
+    return clock.fps, int(round(clock.period/clock.speed*clock.fps)), (width, height)
+
+
+def render_frames(programme_name, frames):
+    """ Calcule les images frames (dans un processus séparé)
+
+    Renvoie la liste des images RGBA (bytes).
+    """
+    module, clock = load(programme_name)
+    images = []
+    for frame in frames:
+        clock.param_widgets.show(**{clock.key:clock.time(frame)})
+        module.fig.canvas.draw()
+        images.append(bytes(module.fig.canvas.buffer_rgba()))
+    return images
+
+
+def chunks(n_frames, size):
+    """ Découpe les images 0..n_frames-1 en morceaux consécutifs"""
+    return [range(start, min(start+size, n_frames)) for start in range(0, n_frames, size)]
+
+
+def ffmpeg_command(filename, size, fps):
+    import matplotlib as mpl
+    fmt = os.path.splitext(filename)[1][1:]
+    if fmt not in codecs:
+        raise ValueError('Format "{}" non supporté ({})'.format(fmt, ', '.join(codecs)))
+    return [mpl.rcParams['animation.ffmpeg_path'], '-y', '-loglevel', 'error',
+            '-f', 'rawvideo', '-pix_fmt', 'rgba', '-s', '{}x{}'.format(*size), '-r', str(fps),
+            '-i', '-'] + codecs[fmt] + [filename]
+
+
+class PillowGif(object):
+    """ Écriture d'un gif avec Pillow (quand ffmpeg n'est pas installé)"""
+    def __init__(self, filename, size, fps):
+        self.filename = filename
+        self.size = size
+        self.fps = fps
+        self.images = []
+
+    def write(self, data):
+        from PIL import Image
+        image = Image.frombuffer('RGBA', self.size, data, 'raw', 'RGBA', 0, 1)
+        self.images.append(image.convert('RGB').quantize())
+
+    def close(self):
+        self.images[0].save(self.filename, save_all=True, append_images=self.images[1:],
+                            duration=int(1000/self.fps), loop=0)
+
+
+def open_encoder(filename, size, fps):
+    import matplotlib as mpl
+    if shutil.which(mpl.rcParams['animation.ffmpeg_path']):
+        return subprocess.Popen(ffmpeg_command(filename, size, fps), stdin=subprocess.PIPE)
+    if filename.endswith('.gif'):
+        return PillowGif(filename, size, fps)
+    raise RuntimeError('ffmpeg est nécessaire pour le format {}'.format(os.path.splitext(filename)[1]))
+
+
+def export_video(programme_name, filename=None, duration=None, dpi=80, jobs=None, chunk_size=8):
+    """ Crée la vidéo de l'animation d'un programme
+
+    duration : durée de la vidéo en secondes (par défaut une période)
+    Renvoie le nombre d'images et la taille du fichier.
+    """
+    filename = filename or os.path.join(video_dir, programme_name + '.mp4')
+    os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(dpi,)) as executor:
+        fps, period, size = executor.submit(info, programme_name).result()
+        n_frames = int(round(duration*fps)) if duration is not None else period
+        encoder = open_encoder(filename, size, fps)
+        stdin = getattr(encoder, 'stdin', encoder)
+        # Au plus deux morceaux d'avance par processus : les images attendent
+        # en mémoire que l'encodeur les lise
+        pending = deque()
+        todo = deque(chunks(n_frames, chunk_size))
+        window = 2*(jobs or os.cpu_count() or 1)
+        try:
+            while todo or pending:
+                while todo and len(pending) < window:
+                    pending.append(executor.submit(render_frames, programme_name, todo.popleft()))
+                for image in pending.popleft().result():
+                    stdin.write(image)
+        finally:
+            if isinstance(encoder, subprocess.Popen):
+                stdin.close()
+                if encoder.wait():
+                    raise RuntimeError('ffmpeg a échoué (code {})'.format(encoder.returncode))
+            else:
+                encoder.close()
+    return n_frames, os.path.getsize(filename)
+
+
+if __name__=='__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('program', help='programme animé')
+    parser.add_argument('-o', '--output', help='fichier .mp4, .webm ou .gif (par défaut _video/<programme>.mp4)')
+    parser.add_argument('--duration', type=float, default=None, help='durée en secondes (par défaut une période)')
+    parser.add_argument('--dpi', type=int, default=80, help='résolution des images')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='nombre de processus')
+    parser.add_argument('--chunk-size', type=int, default=8, help="nombre d'images calculées à la suite par un processus")
+    args = parser.parse_args()
+    t = time.perf_counter()
+    try:
+        n_frames, size = export_video(args.program, args.output, duration=args.duration, dpi=args.dpi,
+                                      jobs=args.jobs, chunk_size=args.chunk_size)
+    except (ValueError, RuntimeError) as e:
+        sys.exit(str(e))
+    print('{} images en {:.1f} s ({})'.format(n_frames, time.perf_counter() - t, format_size(size)))
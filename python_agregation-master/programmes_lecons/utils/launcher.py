@@ -0,0 +1,126 @@
+""" Lanceur des programmes dans un seul interpréteur
+
+Pendant une leçon, on passe d'un programme à l'autre. Lancer chaque script
+dans un nouvel interpréteur réimporte numpy, scipy et matplotlib à chaque
+fois (plusieurs secondes). Le lanceur importe ces modules une seule fois et
+affiche la liste des programmes : cocher un programme ouvre sa figure,
+le décocher (ou fermer la fenêtre) la ferme.
+
+Chaque programme est exécuté avec runpy dans son propre espace de noms : ses
+variables globales ne sont pas partagées avec les autres programmes.
+
+    python -m utils.launcher
+    python -m utils.launcher rlc_serie_force oscillateur_amorti
+"""
+
+import os
+import runpy
+import sys
+import time
+
+# Modules importés une fois pour toutes
+import numpy
+import scipy.integrate
+import scipy.optimize
+import matplotlib.pyplot as plt
+from matplotlib.widgets import CheckButtons
+
+import programmes_lecons.widgets
+
+from .registry import registry
+
+programmes_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Launcher(object):
+    """ Ouvre et ferme les programmes dans l'interpréteur courant
+
+    names : liste des programmes proposés (par défaut, tous les programmes
+        trouvés par utils.registry)
+    """
+    def __init__(self, names=None):
+        titres = {programme['name']:programme['titre'] for programme in registry()}
+        if names is None:
+            names = list(titres)
+        self.names = list(names)
+        self.titres = {name:titres.get(name, name) for name in self.names}
+        self.running = {} # nom -> (espace de noms, figures)
+        self.widget = None
+        self.figure = None
+        self._updating = False
+
+    def open(self, name):
+        """ Exécute le programme name et affiche ses figures"""
+        if name in self.running:
+            return
+        t = time.perf_counter()
+        before = set(plt.get_fignums())
+        namespace = runpy.run_path(os.path.join(programmes_dir, name + '.py'),
+                                   run_name='programme_' + name)
+        figures = [plt.figure(num) for num in plt.get_fignums() if num not in before]
+        self.running[name] = (namespace, figures)
+        self._set_checked(name, True)
+        for fig in figures:
+            fig.canvas.mpl_connect('close_event', lambda event, name=name: self._closed(name))
+            if fig.canvas.required_interactive_framework is not None:
+                # Backend interactif : la fenêtre est créée pendant plt.show()
+                fig.show()
+        print('{} : ouvert en {:.0f} ms'.format(name, (time.perf_counter()-t)*1E3))
+
+    def close(self, name):
+        """ Ferme les figures du programme name"""
+        if name not in self.running:
+            return
+        namespace, figures = self.running.pop(name)
+        for fig in figures:
+            plt.close(fig)
+        self._set_checked(name, False)
+
+    def toggle(self, name):
+        if name in self.running:
+            self.close(name)
+        else:
+            self.open(name)
+
+    def _closed(self, name):
+        # La fenêtre a été fermée par l'utilisateur
+        if name in self.running:
+            self.running.pop(name)
+            self._set_checked(name, False)
+
+    def _set_checked(self, name, state):
+        if self.widget is None:
+            return
+        index = self.names.index(name)
+        if self.widget.get_status()[index] != state:
+            self._updating = True
+            try:
+                self.widget.set_active(index)
+            finally:
+                self._updating = False
+
+    def make_figure(self):
+        """ Fenêtre avec la liste des programmes"""
+        fig = plt.figure(figsize=(6, 0.3*len(self.names)+0.5))
+        if fig.canvas.manager is not None:
+            fig.canvas.manager.set_window_title('Programmes des leçons')
+        ax = fig.add_axes([0.02, 0.02, 0.96, 0.96])
+        labels = [self.titres[name] for name in self.names]
+        self.widget = CheckButtons(ax, labels, [name in self.running for name in self.names])
+
+        def on_clicked(label):
+            if not self._updating:
+                self.toggle(self.names[labels.index(label)])
+        self.widget.on_clicked(on_clicked)
+        self.figure = fig
+        return fig
+
+
+if __name__=='__main__':
+    # Les programmes lisent leurs fichiers de données dans leur répertoire
+    os.chdir(programmes_dir)
+    launcher = Launcher()
+    launcher.make_figure()
+    for name in sys.argv[1:]:
+        launcher.open(name)
+    plt.show()
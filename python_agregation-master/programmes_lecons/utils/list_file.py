@@ -1,12 +1,40 @@
-import subprocess
+""" Liste des programmes pour le README
 
-from .index import tous_les_programmes
+    python -m utils.list_file           # affiche la liste
+    python -m utils.list_file --write   # met à jour README.rst
+"""
 
-lines = []
-for programme_name in tous_les_programmes:
-    _temp = __import__(programme_name, globals(), locals(), ['fig'], 0)
-    _temp.fig.savefig('_pdf/{}.pdf'.format(programme_name))
-    lines.append('* {titre} (`{name}.py <{name}.py>`_)'.format(titre=_temp.titre.strip(), name=programme_name))
+import argparse
 
-print('\n'.join(lines))
+from .registry import registry
 
+readme = 'README.rst'
+section = 'Liste des programmes disponibles'
+
+
+def readme_lines():
+    return ['* {titre} (`{name}.py <{name}.py>`_)'.format(titre=programme['titre'], name=programme['name'])
+            for programme in registry()]
+
+
+def update_readme(filename=readme):
+    """ Remplace la liste des programmes de la section du README"""
+    with open(filename, encoding='utf-8') as f:
+        lines = f.read().split('\n')
+    start = lines.index(section) + 3 # titre, soulignement, ligne vide
+    end = start
+    while end < len(lines) and lines[end].startswith('* '):
+        end += 1
+    lines[start:end] = readme_lines()
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines))
+
+
+if __name__=='__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--write', action='store_true', help='met à jour {}'.format(readme))
+    args = parser.parse_args()
+    if args.write:
+        update_readme()
+    else:
+        print('\n'.join(readme_lines()))
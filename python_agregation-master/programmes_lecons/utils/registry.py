@@ -0,0 +1,184 @@
+""" Liste des programmes obtenue sans les exécuter
+
+Les informations sur un programme (titre, description, paramètres, informations
+de la chaîne de documentation) sont lues dans son code source (module ast) :
+les figures ne sont pas créées et les modèles ne sont pas calculés. Les
+résultats sont gardés dans un cache (utils/.registry_cache.json) et ne sont
+relus que si le fichier a changé.
+
+    from utils.registry import registry
+    for programme in registry():
+        print(programme['name'], programme['titre'])
+"""
+
+import ast
+import glob
+import hashlib
+import json
+import math
+import operator
+import os
+
+programmes_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+cache_file = os.path.join(programmes_dir, 'utils', '.registry_cache.json')
+
+# Valeurs connues lors de l'évaluation des paramètres (min=-np.pi, ...)
+_known_names = {'pi':math.pi, 'np.pi':math.pi, 'numpy.pi':math.pi}
+
+_operators = {ast.Add:operator.add, ast.Sub:operator.sub, ast.Mult:operator.mul,
+              ast.Div:operator.truediv, ast.Pow:operator.pow, ast.FloorDiv:operator.floordiv,
+              ast.Mod:operator.mod, ast.USub:operator.neg, ast.UAdd:operator.pos}
+
+
+def _dotted_name(node):
+    """ Nom (np.pi, ...) d'un nœud Name ou Attribute, None sinon"""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        base = _dotted_name(node.value)
+        return None if base is None else base + '.' + node.attr
+    return None
+
+
+def _evaluate(node, names):
+    """ Évalue une expression constante simple (nombres, chaînes, opérations)
+
+    Lève ValueError si l'expression ne peut pas être évaluée sans exécuter
+    le programme.
+    """
+    if isinstance(node, ast.Constant):
+        return node.value
+    key = _dotted_name(node)
+    if key is not None:
+        if key in names:
+            return names[key]
+        raise ValueError(key)
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _operators:
+        return _operators[type(node.op)](_evaluate(node.operand, names))
+    if isinstance(node, ast.BinOp) and type(node.op) in _operators:
+        return _operators[type(node.op)](_evaluate(node.left, names), _evaluate(node.right, names))
+    raise ValueError(type(node).__name__)
+
+
+def _value(node, names, source):
+    # Valeur de l'expression, ou son code source si elle n'est pas constante
+    try:
+        return _evaluate(node, names)
+    except (ValueError, ArithmeticError, TypeError):
+        return ast.get_source_segment(source, node)
+
+
+def _parameters(node, names, source):
+    """ Sliders du dictionnaire parameters (dict(...) ou {...})"""
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == 'dict':
+        items = [(keyword.arg, keyword.value) for keyword in node.keywords]
+    elif isinstance(node, ast.Dict):
+        items = [(_value(key, names, source), value) for key, value in zip(node.keys, node.values)]
+    else:
+        return None
+    parameters = {}
+    for key, value in items:
+        if not isinstance(value, ast.Call):
+            continue
+        widget = {'type':_dotted_name(value.func) or ast.get_source_segment(source, value.func)}
+        for keyword in value.keywords:
+            widget[keyword.arg] = _value(keyword.value, names, source)
+        parameters[key] = widget
+    return parameters
+
+
+def docstring_metadata(docstring):
+    """ Informations de la chaîne de documentation (lignes "Clé : valeur")"""
+    metadata = {}
+    in_section = False
+    for line in (docstring or '').splitlines():
+        stripped = line.strip()
+        if stripped == 'Informations':
+            in_section = True
+            continue
+        if not in_section or set(stripped) == {'-'}:
+            continue
+        if ':' not in stripped:
+            continue
+        key, _, value = stripped.partition(':')
+        key, value = key.strip(), value.strip()
+        if key == 'Liste des modifications':
+            break
+        if key and value:
+            metadata[key] = value
+    return metadata
+
+
+def parse_program(filename):
+    """ Informations sur un programme, lues dans son code source"""
+    with open(filename, encoding='utf-8') as f:
+        source = f.read()
+    tree = ast.parse(source, filename)
+    docstring = ast.get_docstring(tree)
+    info = {'name':os.path.splitext(os.path.basename(filename))[0],
+            'titre':None, 'description':None, 'parameters':{},
+            'metadata':docstring_metadata(docstring)}
+    names = dict(_known_names)
+    for node in tree.body:
+        if not isinstance(node, ast.Assign) or len(node.targets) != 1 or \
+                not isinstance(node.targets[0], ast.Name):
+            continue
+        target = node.targets[0].id
+        if target == 'parameters':
+            info['parameters'] = _parameters(node.value, names, source) or {}
+            continue
+        try:
+            names[target] = _evaluate(node.value, names)
+        except (ValueError, ArithmeticError, TypeError):
+            continue
+        if target in ['titre', 'description'] and isinstance(names[target], str):
+            info[target] = names[target].strip()
+    return info
+
+
+def _hash(filename):
+    with open(filename, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def _load_cache():
+    try:
+        with open(cache_file) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def registry(directory=programmes_dir, use_cache=True):
+    """ Liste des programmes (triés par nom)
+
+    Un programme est un fichier .py du répertoire qui définit une variable
+    titre.
+    """
+    cache = _load_cache() if use_cache else {}
+    new_cache = {}
+    programmes = []
+    for filename in sorted(glob.glob(os.path.join(directory, '*.py'))):
+        key = os.path.basename(filename)
+        digest = _hash(filename)
+        if key in cache and cache[key]['hash'] == digest:
+            info = cache[key]['info']
+        else:
+            info = parse_program(filename)
+        new_cache[key] = {'hash':digest, 'info':info}
+        if info['titre'] is not None:
+            programmes.append(info)
+    if use_cache and new_cache != cache:
+        try:
+            with open(cache_file, 'w') as f:
+                json.dump(new_cache, f, indent=1)
+        except OSError:
+            pass
+    return programmes
+
+
+if __name__=='__main__':
+    for programme in registry():
+        print('{name:30s} {titre}'.format(**programme))
+        for key, widget in programme['parameters'].items():
+            print('    {:10s} {}'.format(key, widget))
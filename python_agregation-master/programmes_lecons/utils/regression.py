@@ -0,0 +1,209 @@
+""" Tests de non régression des figures des programmes
+
+Chaque programme est exécuté sans fenêtre (backend Agg), dans un pool de
+processus, pour quelques jeux de paramètres fixés (valeurs initiales des
+sliders, puis chaque slider au quart et aux trois quarts de son intervalle).
+Pour chaque jeu de paramètres, on enregistre :
+
+    * des empreintes perceptives de l'image (average hash et difference
+      hash) : deux images presque identiques ont des empreintes proches,
+    * un résumé des données de chaque ligne (nombre de points, min, max,
+      moyenne),
+    * le temps de calcul et de dessin.
+
+Les résultats sont comparés à une référence (fichier JSON créé avec
+--update) : les images et les données qui ont changé, les programmes qui
+ne fonctionnent plus et ceux qui sont devenus plus lents sont signalés.
+
+    python -m utils.regression --update       # crée la référence
+    python -m utils.regression                # compare à la référence
+    python -m utils.regression effet_tunnel   # un seul programme
+"""
+
+import argparse
+import importlib
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .index import tous_les_programmes
+
+reference_file = 'utils/regression_reference.json'
+
+hash_size = 8
+
+
+def average_hash(gray):
+    """ Empreinte : pixels d'une image réduite plus clairs que la moyenne"""
+    small = _resize(gray, hash_size, hash_size)
+    return _to_hex(small > small.mean())
+
+
+def difference_hash(gray):
+    """ Empreinte : sens de variation horizontal de l'image réduite"""
+    small = _resize(gray, hash_size, hash_size+1)
+    return _to_hex(small[:, 1:] > small[:, :-1])
+
+
+def _resize(gray, rows, cols):
+    # Moyenne par blocs (sans dépendance autre que numpy)
+    row_edges = np.linspace(0, gray.shape[0], rows+1).astype(int)
+    col_edges = np.linspace(0, gray.shape[1], cols+1).astype(int)
+    out = np.empty((rows, cols))
+    for i in range(rows):
+        for j in range(cols):
+            out[i, j] = gray[row_edges[i]:row_edges[i+1], col_edges[j]:col_edges[j+1]].mean()
+    return out
+
+
+def _to_hex(bits):
+    return '{:0{}x}'.format(int(''.join('1' if elm else '0' for elm in bits.flat), 2), bits.size//4)
+
+
+def hamming(hash1, hash2):
+    """ Nombre de bits différents entre deux empreintes"""
+    return bin(int(hash1, 16) ^ int(hash2, 16)).count('1')
+
+
+def parameter_sets(parameters):
+    """ Jeux de paramètres testés : valeurs initiales, puis chaque slider à 1/4 et 3/4"""
+    default = {key:widget.value for key, widget in parameters.items()}
+    sets = {'default':default}
+    for key, widget in parameters.items():
+        for label, fraction in [('q1', 0.25), ('q3', 0.75)]:
+            value = widget.min + fraction*(widget.max - widget.min)
+            if hasattr(widget, 'quantize'):
+                value = widget.quantize(value)
+            sets['{}={}'.format(key, label)] = dict(default, **{key:value})
+    return sets
+
+
+def line_summary(lines):
+    """ Résumé des données des lignes (dictionnaire lines des programmes)"""
+    summary = {}
+    for key, line in lines.items():
+        if not hasattr(line, 'get_xydata'):
+            continue
+        data = np.asarray(line.get_xydata(), dtype=float)
+        if data.size == 0:
+            summary[key] = [0]
+            continue
+        with np.errstate(all='ignore'):
+            summary[key] = [len(data)] + [float(f(data[:, 1])) for f in (np.nanmin, np.nanmax, np.nanmean)]
+    return summary
+
+
+def _init_worker():
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def render(programme_name):
+    """ Exécute un programme pour tous ses jeux de paramètres (dans un processus séparé)"""
+    import matplotlib.pyplot as plt
+    np.random.seed(0) # Certains programmes tirent des positions au hasard
+    results = {}
+    t = time.perf_counter()
+    module = importlib.import_module(programme_name)
+    fig = module.fig
+    fig.canvas.draw()
+    results['_import'] = {'time':time.perf_counter() - t}
+
+    parameters = getattr(module, 'parameters', {})
+    param_widgets = getattr(module, 'param_widgets', None)
+    sets = parameter_sets(parameters) if param_widgets is not None else {'default':{}}
+    for label, values in sets.items():
+        t = time.perf_counter()
+        if values:
+            if hasattr(param_widgets, 'set_values'):
+                param_widgets.set_values(**values)
+            else:
+                for key, val in values.items():
+                    param_widgets[key].set_val(val)
+        fig.canvas.draw()
+        duration = time.perf_counter() - t
+        image = np.asarray(fig.canvas.buffer_rgba(), dtype=float)
+        gray = image[:, :, :3].mean(axis=2)
+        results[label] = {'ahash':average_hash(gray), 'dhash':difference_hash(gray),
+                          'lines':line_summary(getattr(module, 'lines', {})),
+                          'time':duration}
+    plt.close('all')
+    return results
+
+
+def _close(a, b, rtol=1E-6):
+    if len(a) != len(b):
+        return False
+    return np.allclose(np.array(a, dtype=float), np.array(b, dtype=float), rtol=rtol, atol=1E-12, equal_nan=True)
+
+
+def compare(result, reference, max_distance=6, slowdown=2, min_time=0.1):
+    """ Liste des différences entre un résultat et la référence
+
+    max_distance : nombre de bits différents accepté pour les empreintes
+    slowdown, min_time : un calcul est signalé s'il est slowdown fois plus
+        lent que la référence et qu'il prend au moins min_time secondes de plus
+    """
+    problems = []
+    ref_time = reference.get('time')
+    if ref_time is not None and result['time'] > slowdown*ref_time and result['time'] - ref_time > min_time:
+        problems.append('plus lent ({:.0f} ms au lieu de {:.0f} ms)'.format(result['time']*1E3, ref_time*1E3))
+    if 'ahash' not in reference:
+        return problems
+    distance = max(hamming(result['ahash'], reference['ahash']), hamming(result['dhash'], reference['dhash']))
+    if distance > max_distance:
+        problems.append('image différente ({} bits)'.format(distance))
+    for key in set(result['lines']) | set(reference['lines']):
+        if key not in result['lines'] or key not in reference['lines']:
+            problems.append('ligne {} ajoutée ou supprimée'.format(key))
+        elif not _close(result['lines'][key], reference['lines'][key]):
+            problems.append('données de la ligne {} différentes'.format(key))
+    return problems
+
+
+def main(names=None, update=False, jobs=None):
+    names = names or tous_les_programmes
+    try:
+        with open(reference_file) as f:
+            references = json.load(f)
+    except (OSError, ValueError):
+        references = {}
+        if not update:
+            print('Pas de référence ({}) : utiliser --update'.format(reference_file))
+
+    failed = False
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as executor:
+        futures = [(name, executor.submit(render, name)) for name in names]
+        for name, future in futures:
+            try:
+                results = future.result()
+            except Exception as e:
+                print('{:30s} ERREUR {!r}'.format(name, e))
+                failed = True
+                continue
+            reference = references.get(name, {})
+            for label, result in results.items():
+                status = compare(result, reference[label]) if label in reference else ['nouveau']
+                if status != ['nouveau'] and status:
+                    failed = True
+                print('{:30s} {:20s} {:7.0f} ms  {}'.format(name, label, result['time']*1E3,
+                                                           ', '.join(status) or 'OK'))
+            if update:
+                references[name] = results
+
+    if update:
+        with open(reference_file, 'w') as f:
+            json.dump(references, f, indent=1)
+    return failed
+
+
+if __name__=='__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('names', nargs='*', help='programmes testés (par défaut tous)')
+    parser.add_argument('--update', action='store_true', help='enregistre les résultats comme référence')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='nombre de processus')
+    args = parser.parse_args()
+    sys.exit(1 if main(args.names, update=args.update, jobs=args.jobs) else 0)
@@ -0,0 +1,197 @@
+""" Planche de figures pour une série de valeurs des paramètres
+
+Le modèle d'un programme est calculé (sans interface, voir
+programmes_lecons.run) pour chaque case de la planche, en parallèle dans un
+pool de processus. Les courbes sont ensuite réunies dans une seule figure
+dont les cases ont les mêmes axes (limites, échelles, légendes des axes) et
+le même style de lignes que le programme. Seules les lignes visibles au
+démarrage du programme sont tracées.
+
+Les valeurs d'un paramètre sont données par début:fin:nombre ou par une
+liste v1,v2,... Avec un seul paramètre, les cases sont rangées en lignes
+(--cols cases par ligne) ; avec deux, le premier paramètre varie d'une
+ligne à l'autre et le second d'une colonne à l'autre. Les autres paramètres
+gardent leur valeur initiale ou celle donnée par --param.
+
+    python -m utils.sweep diffraction_N_fentes N=2:30:8
+    python -m utils.sweep loi_de_planck T=1000:10000:10 --autoscale -o planck.pdf
+    python -m utils.sweep diffraction_N_fentes N=2,5,10 a=2,4 --param b=0.5
+"""
+
+import argparse
+import itertools
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from programmes_lecons.export import save_figure, format_size
+from programmes_lecons.run import load_program, evaluate, parse_param
+from programmes_lecons.widgets import IntSlider
+
+sweep_dir = '_sweep'
+
+_namespaces = {}
+
+
+def _init_worker():
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def _load(programme_name):
+    """ Exécute le programme (une seule fois par processus)"""
+    if programme_name not in _namespaces:
+        _namespaces[programme_name] = load_program(programme_name, all_lines=False)
+    return _namespaces[programme_name]
+
+
+def data_axes(namespace):
+    """ Axes de la figure qui contiennent des lignes du dictionnaire lines"""
+    lines = [line for line in namespace.get('lines', {}).values() if hasattr(line, 'get_xydata')]
+    return [ax for ax in namespace['fig'].axes if any(line.axes is ax for line in lines)]
+
+
+def visible_lines(namespace, axes_index=0):
+    """ Lignes (du dictionnaire lines) visibles dans les axes de données axes_index"""
+    axes = data_axes(namespace)
+    if axes_index >= len(axes):
+        raise ValueError("Le programme n'a que {} axes avec des lignes".format(len(axes)))
+    return {key:line for key, line in namespace['lines'].items()
+            if hasattr(line, 'get_xydata') and line.get_visible() and line.axes is axes[axes_index]}
+
+
+def line_style(line):
+    """ Style d'une ligne du programme (arguments de plot)"""
+    return dict(color=line.get_color(), linewidth=line.get_linewidth(), linestyle=line.get_linestyle(),
+                marker=line.get_marker(), markersize=line.get_markersize(),
+                markerfacecolor=line.get_markerfacecolor(), markeredgecolor=line.get_markeredgecolor(),
+                alpha=line.get_alpha(), drawstyle=line.get_drawstyle(), zorder=line.get_zorder())
+
+
+def compute(programme_name, values, axes_index=0):
+    """ Données et style des lignes visibles pour les paramètres values (dans un processus séparé)
+
+    Certains programmes ajoutent des lignes selon les paramètres : les lignes
+    sont donc lues après le calcul.
+    """
+    namespace = _load(programme_name)
+    data = evaluate(namespace, **values)
+    return {key:data[key] + (line_style(line),) for key, line in visible_lines(namespace, axes_index).items()}
+
+
+def parse_range(text, widget):
+    """ 'N=2:30:8' ou 'N=2,5,10' -> ('N', valeurs)"""
+    key, sep, value = text.partition('=')
+    if not sep:
+        raise ValueError('Paramètre "{}" : utiliser nom=début:fin:nombre ou nom=v1,v2,...'.format(text))
+    if ':' in value:
+        start, stop, count = value.split(':')
+        values = np.linspace(float(start), float(stop), int(count))
+    else:
+        values = np.array([float(elm) for elm in value.split(',')])
+    if isinstance(widget, IntSlider):
+        values = np.unique(np.round(values).astype(int))
+    return key.strip(), values.tolist()
+
+
+def _format(value):
+    return '{:g}'.format(value) if isinstance(value, float) else str(value)
+
+
+def make_sheet(programme_name, sweeps, fixed=None, cols=None, autoscale=False, axes_index=0, jobs=None):
+    """ Crée la planche
+
+    sweeps : liste d'un ou deux couples (nom du paramètre, valeurs)
+    fixed : valeurs des autres paramètres
+    cols : nombre de cases par ligne (un seul paramètre)
+    autoscale : limites des axes ajustées aux courbes (communes à toutes les cases)
+    """
+    import matplotlib.pyplot as plt
+    fixed = fixed or {}
+    namespace = load_program(programme_name, all_lines=False)
+    evaluate(namespace, **fixed)
+    program_ax = data_axes(namespace)[axes_index]
+
+    cells = [dict(fixed, **dict(zip([key for key, _ in sweeps], combination)))
+             for combination in itertools.product(*[values for _, values in sweeps])]
+    if len(sweeps) == 2:
+        nrows, ncols = len(sweeps[0][1]), len(sweeps[1][1])
+    else:
+        ncols = cols or math.ceil(math.sqrt(len(cells)))
+        nrows = math.ceil(len(cells)/ncols)
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as executor:
+        results = list(executor.map(compute, [programme_name]*len(cells), cells, [axes_index]*len(cells)))
+
+    fig, axes = plt.subplots(nrows, ncols, sharex=True, sharey=True, squeeze=False,
+                             figsize=(3*ncols+1, 2.2*nrows+1))
+    fig.suptitle(namespace.get('titre', programme_name))
+    handles = {}
+    for ax, values, data in itertools.zip_longest(axes.flat, cells, results):
+        if values is None:
+            ax.set_visible(False)
+            continue
+        for key, (x, y, style) in data.items():
+            if len(x):
+                handles.setdefault(key, ax.plot(x, y, label=key, **style)[0])
+        ax.set_title(', '.join('{} = {}'.format(key, _format(values[key])) for key, _ in sweeps),
+                     fontsize='medium')
+    for ax in axes.flat:
+        ax.label_outer()
+    fig.supxlabel(program_ax.get_xlabel())
+    fig.supylabel(program_ax.get_ylabel())
+    ax = axes.flat[0]
+    ax.set_xscale(program_ax.get_xscale())
+    ax.set_yscale(program_ax.get_yscale())
+    if not autoscale:
+        ax.set_xlim(program_ax.get_xlim())
+        ax.set_ylim(program_ax.get_ylim())
+    if len(handles) > 1:
+        fig.legend(list(handles.values()), list(handles), loc='upper right')
+    return fig
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('program', help='nom du programme')
+    parser.add_argument('sweeps', nargs='+', help='valeurs d\'un paramètre (nom=début:fin:nombre ou nom=v1,v2,...)')
+    parser.add_argument('--param', type=parse_param, action='append', default=[],
+                        help='valeur d\'un paramètre fixé (nom=valeur)')
+    parser.add_argument('--cols', type=int, default=None, help='nombre de cases par ligne')
+    parser.add_argument('--autoscale', action='store_true', help='ajuste les limites des axes aux courbes')
+    parser.add_argument('--axes', type=int, default=0, help='numéro des axes tracés (programmes à plusieurs axes)')
+    parser.add_argument('-o', '--output', help='fichier de sortie (par défaut _sweep/<programme>_<paramètres>.pdf)')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='nombre de processus')
+    args = parser.parse_args(argv)
+
+    if len(args.sweeps) > 2:
+        parser.error('Au plus deux paramètres varient')
+    parameters = load_program(args.program, all_lines=False).get('parameters', {})
+    sweeps = []
+    for text in args.sweeps:
+        key = text.partition('=')[0].strip()
+        if key not in parameters:
+            parser.error('Paramètre inconnu : {}'.format(key))
+        try:
+            sweeps.append(parse_range(text, parameters[key]))
+        except ValueError as e:
+            parser.error(str(e))
+    fixed = dict(args.param)
+    unknown = set(fixed) - set(parameters)
+    if unknown:
+        parser.error('Paramètres inconnus : {}'.format(', '.join(sorted(unknown))))
+
+    fig = make_sheet(args.program, sweeps, fixed=fixed, cols=args.cols, autoscale=args.autoscale,
+                     axes_index=args.axes, jobs=args.jobs)
+    output = args.output or os.path.join(sweep_dir, '{}_{}.pdf'.format(args.program, '_'.join(key for key, _ in sweeps)))
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    size = save_figure(fig, output)
+    cells = sum(ax.get_visible() for ax in fig.axes)
+    print('{} cases enregistrées dans {} ({})'.format(cells, output, format_size(size)))
+
+
+if __name__=='__main__':
+    sys.exit(main())
@@ -28,7 +28,7 @@ import numpy as np
 
 from programmes_lecons import FloatSlider, IntSlider
 from programmes_lecons import make_param_widgets, make_choose_plot, make_reset_button, make_log_button
-from programmes_lecons import justify
+from programmes_lecons import justify, cached_text
 
 titre = 'Transition liquide-vapeur pour un fluide de Van der Waals'
 
@@ -113,8 +113,6 @@ def plot_data(Tr):
         lines["spin"].set_visible(False)
         lines["sat"].set_visible(False)
 
-    fig.canvas.draw_idle()
-
 
 #===========================================================
 # --- Création de la figure et mise en page ----------------
@@ -122,7 +120,7 @@ def plot_data(Tr):
 
 fig = plt.figure()
 fig.suptitle(titre)
-fig.text(0.02, .93, justify(description, 120), multialignment='left', verticalalignment='top')
+cached_text(fig, 0.02, .93, justify(description, 120), multialignment='left', verticalalignment='top')
 
 ax = fig.add_axes([0.05, 0.16, 0.9, 0.7])
 